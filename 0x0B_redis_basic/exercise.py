@@ -4,7 +4,7 @@
 import functools
 import redis
 import uuid
-from typing import Any, Callable, Optional, TypeVar, Union
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
 
 
 def count_calls(method: Callable) -> Callable:
@@ -68,6 +68,33 @@ class Cache:
         self._redis.set(random_key, data)
         return random_key
 
+    def put(self, key: str, data: Union[str, bytes, int, float],
+            ttl: Optional[float] = None) -> None:
+        """Store the input data under the given key,
+        expiring after ttl seconds if ttl is given."""
+        px = None if ttl is None else max(int(ttl * 1000), 1)
+        self._redis.set(key, data, px=px)
+
+    def put_many(self, mapping: Dict[str, Union[str, bytes, int, float]],
+                 ttl: Optional[float] = None) -> None:
+        """Store several items in one round trip (MSET, or a pipeline
+        of SET when they expire after ttl seconds)."""
+        if not mapping:
+            return
+        if ttl is None:
+            self._redis.mset(mapping)
+            return
+        px = max(int(ttl * 1000), 1)
+        pipe = self._redis.pipeline(transaction=False)
+        for key, data in mapping.items():
+            pipe.set(key, data, px=px)
+        pipe.execute()
+
+    def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Fetch several keys in one round trip (MGET),
+        None for the missing ones."""
+        return self._redis.mget(keys) if keys else []
+
     def get(
             self, key: str, fn: Optional[Callable[[bytes], TypeVar]] = None
     ) -> Optional[Union[bytes, TypeVar]]:
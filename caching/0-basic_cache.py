@@ -9,28 +9,15 @@ class BasicCache(BaseCaching):
     BasicCache is a caching system that inherits from BaseCaching.
     It implements a simple caching mechanism
     without any limit on item count or eviction policy.
+    When it is given a max_items or max_bytes bound anyway,
+    the oldest item is discarded to stay within it.
     """
-    def put(self, key, item):
-        """
-        Add an item to the cache.
-        If either key or item is None, the method does nothing.
-        Args:
-            key: The key under which to store the item.
-            item: The item to be stored.
-        """
-        if key is None or item is None:
-            return
-        self.cache_data[key] = item
+    MAX_ITEMS = None
 
-    def get(self, key):
+    def _victim(self):
         """
-        Retrieve an item from the cache by its key.
-        If the key is None or not found, return None.
-        Args:
-            key: The key of the item to retrieve.
+        Return the oldest inserted key.
         Returns:
-            The item if found, otherwise None.
+            The key at the front of cache_data.
         """
-        if key is None or key not in self.cache_data:
-            return None
-        return self.cache_data.get(key)
+        return next(iter(self.cache_data))
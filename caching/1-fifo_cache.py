@@ -10,42 +10,12 @@ class FIFOCache(BaseCaching):
     It implements the FIFO (First-In, First-Out) caching strategy:
     when the cache exceeds the maximum number of items,
     the oldest item is discarded.
+    Updating an existing key keeps its insertion position.
     """
-    def __init__(self):
+    def _victim(self):
         """
-        Initialize the cache.
-        Calls the parent constructor and
-        initializes a list to track insertion order.
-        """
-        super().__init__()
-        self.key_save = []
-
-    def put(self, key, item):
-        """
-        Add an item to the cache.
-        If the cache exceeds the max size, discard the oldest item (FIFO).
-        Args:
-            key: The key under which to store the item.
-            item: The item to be stored.
-        """
-        if key is None or item is None:
-            return
-        if len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-            first_key = self.key_save.pop(0)
-            del self.cache_data[first_key]
-            print(f"DISCARD: {first_key}")
-        self.key_save.append(key)
-        self.cache_data[key] = item
-
-    def get(self, key):
-        """
-        Retrieve an item from the cache by its key.
-        If the key is None or not found, return None.
-        Args:
-            key: The key of the item to retrieve.
+        Return the oldest inserted key (FIFO).
         Returns:
-            The item if found, otherwise None.
+            The key at the front of cache_data.
         """
-        if key is None or key not in self.cache_data:
-            return None
-        return self.cache_data.get(key)
+        return next(iter(self.cache_data))
@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+""" LFUCache module """
+
+from collections import OrderedDict
+from base_caching import BaseCaching
+
+
+class LFUCache(BaseCaching):
+    """
+    LFUCache is a caching system that inherits from BaseCaching.
+    It implements the LFU (Least Frequently Used) caching strategy:
+    when the cache exceeds the maximum number of items,
+    the least frequently used item is discarded,
+    and the least recently used one among them breaks ties.
+
+    Keys are grouped in one bucket per use count, each bucket being an
+    OrderedDict in LRU order, so every operation is O(1).
+    Every `age_period` operations all counts are halved, so items that
+    were hot a long time ago don't stick in the cache forever.
+    """
+    def __init__(self, max_items=None, age_period=None, **kwargs):
+        """
+        Initialize the cache.
+        Args:
+            max_items: capacity of this instance (MAX_ITEMS if None).
+            age_period: number of put/get between two agings
+                (10 times the capacity if None).
+            kwargs: other options of BaseCaching (max_bytes, sizeof,
+                on_discard, sample_every, arena, separator).
+        """
+        super().__init__(max_items, **kwargs)
+        if age_period is None:
+            age_period = 10 * (self.max_items or self.MAX_ITEMS)
+        self.age_period = age_period
+        self.freq = {}
+        self.buckets = {}
+        self.min_freq = 0
+        self.ops = 0
+
+    def _on_insert(self, key):
+        """
+        Start a new key in the count-1 bucket.
+        Args:
+            key: The key that was just stored.
+        """
+        self.freq[key] = 1
+        self.buckets.setdefault(1, OrderedDict())[key] = None
+        self.min_freq = 1
+        self._tick()
+
+    def _on_access(self, key):
+        """
+        Move the key to the next count bucket, as most recently used.
+        Args:
+            key: The key that was just read or updated.
+        """
+        count = self.freq[key]
+        bucket = self.buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[count]
+            if self.min_freq == count:
+                self.min_freq = count + 1
+        self.freq[key] = count + 1
+        self.buckets.setdefault(count + 1, OrderedDict())[key] = None
+        self._tick()
+
+    _on_update = _on_access
+
+    def _on_discard(self, key):
+        """
+        Forget the use count of a removed key.
+        Args:
+            key: The key that was removed from cache_data.
+        """
+        count = self.freq.pop(key)
+        bucket = self.buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[count]
+
+    def _victim(self):
+        """
+        Return the least recently used key of the lowest count bucket.
+        Returns:
+            The key to discard.
+        """
+        if self.min_freq not in self.buckets:
+            self.min_freq = min(self.buckets)
+        return next(iter(self.buckets[self.min_freq]))
+
+    def _tick(self):
+        """
+        Count one operation and age the counts once per period.
+        """
+        self.ops += 1
+        if self.ops >= self.age_period:
+            self.ops = 0
+            self.age()
+
+    def _dump_state(self):
+        """
+        Save the buckets, in count order, with their LRU order.
+        Returns:
+            The state restored by _load_state.
+        """
+        return ([(count, list(bucket)) for count, bucket
+                 in sorted(self.buckets.items())], self.ops)
+
+    def _load_state(self, state):
+        """
+        Rebuild the buckets saved by _dump_state.
+        Args:
+            state: The state returned by _dump_state.
+        """
+        buckets, self.ops = state
+        self.buckets, self.freq = {}, {}
+        for count, keys in buckets:
+            self.buckets[count] = OrderedDict.fromkeys(keys)
+            self.freq.update(dict.fromkeys(keys, count))
+        self.min_freq = min(self.buckets) if self.buckets else 0
+
+    def age(self):
+        """
+        Halve every use count (never below 1).
+        Buckets are merged from the lowest count up, so the LRU order
+        inside a bucket is kept. Amortized O(1) per operation.
+        """
+        buckets = {}
+        for count in sorted(self.buckets):
+            aged = max(count >> 1, 1)
+            merged = buckets.setdefault(aged, OrderedDict())
+            for key in self.buckets[count]:
+                merged[key] = None
+                self.freq[key] = aged
+        self.buckets = buckets
+        self.min_freq = min(buckets) if buckets else 0
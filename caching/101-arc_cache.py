@@ -0,0 +1,147 @@
+#!/usr/bin/python3
+""" ARCCache module """
+
+from collections import OrderedDict
+from base_caching import BaseCaching
+
+
+class ARCCache(BaseCaching):
+    """
+    ARCCache is a caching system that inherits from BaseCaching.
+    It implements ARC (Adaptive Replacement Cache):
+    keys seen once live in t1, keys seen at least twice in t2.
+    Discarded keys are remembered (without their item) in the ghost
+    lists b1 and b2, and a hit on a ghost moves the target size p of
+    t1 towards the list that would have kept it.
+    A sequential scan only flows through t1, so the frequently used
+    keys of t2 survive it.
+    """
+    def __init__(self, max_items=None, **kwargs):
+        """
+        Initialize the cache.
+        Args:
+            max_items: capacity of this instance (MAX_ITEMS if None).
+            kwargs: other options of BaseCaching (max_bytes, sizeof,
+                on_discard, sample_every, arena, separator).
+        """
+        super().__init__(max_items, **kwargs)
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+        self.p = 0
+        self.ghost_hit = False
+        self.from_b2 = False
+
+    def put(self, key, item, ttl=None):
+        """
+        Add an item to the cache.
+        A new key found in a ghost list adapts p before anything is
+        discarded, then goes straight to t2.
+        Args:
+            key: The key under which to store the item.
+            item: The item to be stored.
+            ttl: Seconds before the item expires (never if None).
+        """
+        if key is not None and item is not None and \
+                key not in self.cache_data:
+            self.ghost_hit = self.from_b2 = False
+            if key in self.b1:
+                step = max(len(self.b2) // len(self.b1), 1)
+                self.p = min(self.max_items, self.p + step)
+                del self.b1[key]
+                self.ghost_hit = True
+            elif key in self.b2:
+                step = max(len(self.b1) // len(self.b2), 1)
+                self.p = max(0, self.p - step)
+                del self.b2[key]
+                self.ghost_hit = self.from_b2 = True
+        super().put(key, item, ttl)
+
+    def put_many(self, mapping, ttl=None):
+        """
+        Add several items, one put each: the ghost lists must be checked
+        before the room is made for every new key.
+        Args:
+            mapping: A dict or (key, item) pairs.
+            ttl: Seconds before the items expire (never if None).
+        """
+        items = mapping.items() if hasattr(mapping, "items") else mapping
+        for key, item in items:
+            self.put(key, item, ttl)
+
+    def _on_insert(self, key):
+        """
+        Store a new key in t1, or in t2 after a ghost hit.
+        Args:
+            key: The key that was just stored.
+        """
+        if self.ghost_hit:
+            self.t2[key] = None
+        else:
+            self.t1[key] = None
+
+    def _on_access(self, key):
+        """
+        Promote the key to the most recently used end of t2.
+        Args:
+            key: The key that was just read or updated.
+        """
+        if key in self.t1:
+            del self.t1[key]
+            self.t2[key] = None
+        else:
+            self.t2.move_to_end(key)
+
+    _on_update = _on_access
+
+    def _victim(self):
+        """
+        Return the LRU key of t1 while t1 is above its target p,
+        otherwise the LRU key of t2.
+        Returns:
+            The key to discard.
+        """
+        if self.t1 and (not self.t2 or len(self.t1) > self.p or
+                        (self.from_b2 and len(self.t1) == self.p)):
+            return next(iter(self.t1))
+        return next(iter(self.t2))
+
+    def _dump_state(self):
+        """
+        Save p and the four lists in LRU order.
+        Returns:
+            The state restored by _load_state.
+        """
+        return (self.p, list(self.t1), list(self.t2),
+                list(self.b1), list(self.b2))
+
+    def _load_state(self, state):
+        """
+        Rebuild the lists saved by _dump_state.
+        Args:
+            state: The state returned by _dump_state.
+        """
+        self.p = state[0]
+        self.t1, self.t2, self.b1, self.b2 = [
+            OrderedDict.fromkeys(keys) for keys in state[1:]]
+
+    def _on_discard(self, key):
+        """
+        Move the removed key to its ghost list and keep the ghost
+        lists within their bounds (|t1|+|b1| <= c, total <= 2c) once
+        the incoming key is stored.
+        Args:
+            key: The key that was removed from cache_data.
+        """
+        if key in self.t1:
+            del self.t1[key]
+            self.b1[key] = None
+        else:
+            del self.t2[key]
+            self.b2[key] = None
+        c = self.max_items
+        while self.b1 and len(self.t1) + len(self.b1) >= c:
+            self.b1.popitem(last=False)
+        while len(self.cache_data) + len(self.b1) + len(self.b2) >= 2 * c:
+            (self.b2 or self.b1).popitem(last=False)
@@ -0,0 +1,185 @@
+#!/usr/bin/python3
+""" WTinyLFUCache module """
+
+from collections import OrderedDict
+from base_caching import BaseCaching
+
+HALVE = bytes(i >> 1 for i in range(256))
+
+
+class CountMinSketch():
+    """
+    CountMinSketch estimates how often a key was seen with 4 rows of
+    small saturating counters stored in a single bytearray.
+    After `sample_size` additions every counter is halved, so the
+    estimates follow the recent popularity of the keys.
+    """
+    SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F,
+             0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+    MAX_COUNT = 15
+
+    def __init__(self, width, sample_size):
+        """
+        Initialize the sketch.
+        Args:
+            width: minimum number of counters per row
+                (rounded up to a power of two).
+            sample_size: number of additions between two halvings.
+        """
+        self.width = 1 << max(width - 1, 1).bit_length()
+        self.table = bytearray(self.width * len(self.SEEDS))
+        self.sample_size = sample_size
+        self.additions = 0
+
+    def _indexes(self, key):
+        """
+        Return the counter index of key in every row.
+        """
+        h = hash(key)
+        mask = self.width - 1
+        return [row * self.width +
+                ((((h * seed) & 0xFFFFFFFFFFFFFFFF) >> 32) & mask)
+                for row, seed in enumerate(self.SEEDS)]
+
+    def add(self, key):
+        """
+        Count one occurrence of key.
+        """
+        table = self.table
+        for i in self._indexes(key):
+            if table[i] < self.MAX_COUNT:
+                table[i] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.additions = 0
+            self.table = self.table.translate(HALVE)
+
+    def estimate(self, key):
+        """
+        Return the estimated number of recent occurrences of key.
+        """
+        table = self.table
+        return min(table[i] for i in self._indexes(key))
+
+
+class WTinyLFUCache(BaseCaching):
+    """
+    WTinyLFUCache is a caching system that inherits from BaseCaching.
+    It implements W-TinyLFU:
+    new keys enter a small LRU window (about 1% of the capacity),
+    the rest of the cache is a segmented LRU (probation + protected).
+    A key leaving the full window only enters the main segment if the
+    count-min sketch says it is used more often than the key it would
+    replace, so a scan of one-hit keys can't flush the cache.
+    """
+    WINDOW_RATIO = 0.01
+    PROTECTED_RATIO = 0.8
+
+    def __init__(self, max_items=None, **kwargs):
+        """
+        Initialize the cache.
+        Args:
+            max_items: capacity of this instance (MAX_ITEMS if None).
+            kwargs: other options of BaseCaching (max_bytes, sizeof,
+                on_discard, sample_every, arena, separator).
+        """
+        super().__init__(max_items, **kwargs)
+        self.window_size = max(1, int(self.max_items * self.WINDOW_RATIO))
+        main_size = max(self.max_items - self.window_size, 0)
+        self.protected_size = int(main_size * self.PROTECTED_RATIO)
+        self.sketch = CountMinSketch(self.max_items, 10 * self.max_items)
+        self.window = OrderedDict()
+        self.probation = OrderedDict()
+        self.protected = OrderedDict()
+
+    def _on_insert(self, key):
+        """
+        Store a new key in the window, spilling the window LRU key into
+        probation if the window is over its size.
+        Args:
+            key: The key that was just stored.
+        """
+        self.sketch.add(key)
+        self.window[key] = None
+        if len(self.window) > self.window_size:
+            spilled, _ = self.window.popitem(last=False)
+            self.probation[spilled] = None
+
+    def _on_access(self, key):
+        """
+        Refresh the key: window keys stay in the window, probation keys
+        are promoted to protected, demoting its LRU key if needed.
+        Args:
+            key: The key that was just read or updated.
+        """
+        self.sketch.add(key)
+        if key in self.window:
+            self.window.move_to_end(key)
+        elif key in self.probation:
+            del self.probation[key]
+            self.protected[key] = None
+            if len(self.protected) > self.protected_size:
+                demoted, _ = self.protected.popitem(last=False)
+                self.probation[demoted] = None
+        else:
+            self.protected.move_to_end(key)
+
+    _on_update = _on_access
+
+    def _victim(self):
+        """
+        Let the window LRU key (candidate) and the main LRU key (victim)
+        compete on their estimated frequency; the loser is discarded.
+        A winning candidate moves from the window to probation.
+        Returns:
+            The key to discard.
+        """
+        victim = next(iter(self.probation or self.protected), None)
+        if victim is not None and len(self.window) < self.window_size:
+            return victim
+        candidate = next(iter(self.window), None)
+        if victim is None:
+            return candidate
+        if candidate is None:
+            return victim
+        if self.sketch.estimate(candidate) > self.sketch.estimate(victim):
+            del self.window[candidate]
+            self.probation[candidate] = None
+            return victim
+        return candidate
+
+    def _dump_state(self):
+        """
+        Save the three segments in LRU order and the sketch counters.
+        Returns:
+            The state restored by _load_state.
+        """
+        return (list(self.window), list(self.probation),
+                list(self.protected), bytes(self.sketch.table),
+                self.sketch.additions)
+
+    def _load_state(self, state):
+        """
+        Rebuild the segments and the sketch saved by _dump_state.
+        The counters are dropped if the sketch width changed.
+        Args:
+            state: The state returned by _dump_state.
+        """
+        window, probation, protected, table, additions = state
+        self.window = OrderedDict.fromkeys(window)
+        self.probation = OrderedDict.fromkeys(probation)
+        self.protected = OrderedDict.fromkeys(protected)
+        if len(table) == len(self.sketch.table):
+            self.sketch.table = bytearray(table)
+            self.sketch.additions = additions
+
+    def _on_discard(self, key):
+        """
+        Remove the key from its segment.
+        Args:
+            key: The key that was removed from cache_data.
+        """
+        for segment in (self.window, self.probation, self.protected):
+            if key in segment:
+                del segment[key]
+                return
@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+""" GDSCache module """
+
+import heapq
+import sys
+from base_caching import BaseCaching
+
+
+class GDSCache(BaseCaching):
+    """
+    GDSCache is a caching system that inherits from BaseCaching.
+    It implements GreedyDual-Size, a cost-aware policy:
+    every key gets a priority H = L + cost / size, the key with the
+    lowest H is discarded and L is raised to its H.
+    Small or expensive items stay longer, and L ages the priorities
+    of keys that haven't been used for a while.
+
+    Priorities are kept in a heap with lazy deletion, so put and get
+    are O(log n).
+    """
+    def __init__(self, max_items=None, cost=None, sizeof=None, **kwargs):
+        """
+        Initialize the cache.
+        Args:
+            max_items: capacity of this instance (MAX_ITEMS if None).
+            cost: function returning the cost of (re)loading a key
+                (1 for every key if None).
+            sizeof: size estimator (sys.getsizeof if None).
+            kwargs: other options of BaseCaching (max_bytes,
+                on_discard, sample_every, arena, separator).
+        """
+        super().__init__(max_items, sizeof=sizeof or sys.getsizeof,
+                         **kwargs)
+        self.cost = cost
+        self.inflation = 0
+        self.priority = {}
+        self.heap = []
+        self.counter = 0
+
+    def _on_access(self, key):
+        """
+        Reset the priority of the key to L + cost / size.
+        Args:
+            key: The key that was just stored, read or updated.
+        """
+        cost = 1 if self.cost is None else self.cost(key)
+        h = self.inflation + cost / max(self.sizes[key], 1)
+        self.counter += 1
+        self.priority[key] = (h, self.counter)
+        heapq.heappush(self.heap, (h, self.counter, key))
+        if len(self.heap) > 2 * len(self.priority) + 64:
+            self.heap = [(h, n, k) for k, (h, n) in self.priority.items()]
+            heapq.heapify(self.heap)
+
+    _on_insert = _on_update = _on_access
+
+    def _victim(self):
+        """
+        Return the key with the lowest priority and raise L to it.
+        Outdated heap entries are dropped on the way.
+        Returns:
+            The key to discard.
+        """
+        heap = self.heap
+        while True:
+            h, n, key = heap[0]
+            if self.priority.get(key) == (h, n):
+                self.inflation = h
+                return key
+            heapq.heappop(heap)
+
+    def _dump_state(self):
+        """
+        Save L and the priority of every key.
+        Returns:
+            The state restored by _load_state.
+        """
+        return self.inflation, self.counter, self.priority
+
+    def _load_state(self, state):
+        """
+        Rebuild the priority heap saved by _dump_state.
+        Args:
+            state: The state returned by _dump_state.
+        """
+        self.inflation, self.counter, self.priority = state
+        self.heap = [(h, n, k) for k, (h, n) in self.priority.items()]
+        heapq.heapify(self.heap)
+
+    def _on_discard(self, key):
+        """
+        Forget the priority of a removed key.
+        Args:
+            key: The key that was removed from cache_data.
+        """
+        del self.priority[key]
@@ -0,0 +1,28 @@
+#!/usr/bin/python3
+""" 103-main """
+GDSCache = __import__('103-gds_cache').GDSCache
+LRUCache = __import__('3-lru_cache').LRUCache
+
+my_cache = LRUCache(max_items=100, max_bytes=20, sizeof=len)
+my_cache.put("A", "Hello")
+my_cache.put("B", "World")
+my_cache.put("C", "Holberton")
+my_cache.print_cache()
+print(my_cache.total_bytes)
+my_cache.put("D", "School")
+my_cache.print_cache()
+print(my_cache.total_bytes)
+my_cache.put("E", "A" * 21)
+my_cache.print_cache()
+
+my_cache = GDSCache(max_items=100, max_bytes=20, sizeof=len)
+my_cache.put("A", "Hello")
+my_cache.put("B", "Holberton")
+my_cache.put("C", "Wo")
+my_cache.print_cache()
+my_cache.put("D", "School")
+my_cache.print_cache()
+print(my_cache.get("B"))
+my_cache.put("E", "Battery")
+my_cache.print_cache()
+print(my_cache.total_bytes)
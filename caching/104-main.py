@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+""" 104-main: throughput of ShardedCache for 1 to 8 threads """
+import contextlib
+import io
+import random
+import threading
+import time
+ShardedCache = __import__('104-sharded_cache').ShardedCache
+FIFOCache = __import__('1-fifo_cache').FIFOCache
+LRUCache = __import__('3-lru_cache').LRUCache
+
+OPS = 200000
+
+
+class GlobalLockCache():
+    """ One LRUCache behind a single lock, the baseline """
+    def __init__(self, max_items):
+        """ Wrap a new LRUCache of max_items """
+        self.cache = LRUCache(max_items)
+        self.lock = threading.Lock()
+
+    def put(self, key, item):
+        """ Put under the lock """
+        with self.lock:
+            self.cache.put(key, item)
+
+    def get(self, key):
+        """ Get under the lock """
+        with self.lock:
+            return self.cache.get(key)
+
+
+def worker(cache, keys):
+    """ Get every key, putting the missing ones """
+    for key in keys:
+        if cache.get(key) is None:
+            cache.put(key, key)
+
+
+def run(cache, threads):
+    """ Ops per second of threads workers sharing cache """
+    random.seed(0)
+    keys = [int(random.paretovariate(1.1)) % 20000 for _ in range(OPS)]
+    chunk = OPS // threads
+    pool = [threading.Thread(target=worker,
+                             args=(cache, keys[i * chunk:(i + 1) * chunk]))
+            for i in range(threads)]
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+    return OPS / (time.perf_counter() - start)
+
+
+my_cache = ShardedCache(LRUCache, shards=4, max_items=32)
+for key in "ABCDEFGH":
+    my_cache.put(key, key.lower())
+my_cache.print_cache()
+print(my_cache.get("A"))
+
+print("{:>7} {:>12} {:>12} {:>12}".format(
+    "threads", "global-lock", "sharded-lru", "sharded-fifo"))
+for threads in (1, 2, 4, 8):
+    print("{:>7} {:>12.0f} {:>12.0f} {:>12.0f}".format(
+        threads,
+        run(GlobalLockCache(5000), threads),
+        run(ShardedCache(LRUCache, 16, 5000), threads),
+        run(ShardedCache(FIFOCache, 16, 5000), threads)))
@@ -0,0 +1,235 @@
+#!/usr/bin/python3
+""" ShardedCache module """
+
+import sys
+import threading
+from itertools import islice
+from base_caching import BaseCaching
+from cache_stats import CacheStats
+
+
+class ShardedCache():
+    """
+    ShardedCache is a thread-safe container of caching systems.
+    Keys are hashed across `shards` independent caches of the given
+    policy (any BaseCaching subclass), each one behind its own lock,
+    so threads working on different shards don't wait for each other.
+
+    Policies whose get doesn't reorder anything (BasicCache, FIFOCache,
+    LIFOCache) are read without taking the lock at all: a dict lookup
+    is atomic, and only a shard holding items with a ttl falls back to
+    the locked path because its get may remove an expired item. Those
+    reads still count hits and misses in the stats of their shard
+    (without the lock, so concurrent reads may lose a few counts), and
+    shards sampling latencies are always read under their lock.
+    Batches are split by shard, with one lock acquisition per shard.
+    """
+    def __init__(self, policy, shards=16, max_items=None, **kwargs):
+        """
+        Initialize the shards.
+        Args:
+            policy: BaseCaching subclass used by every shard.
+            shards: number of shards.
+            max_items: total capacity, split evenly between the shards
+                (policy.MAX_ITEMS per shard if None).
+            kwargs: other options of the policy; max_bytes is split
+                evenly between the shards too.
+        """
+        if max_items is not None:
+            max_items = -(-max_items // shards)
+        if kwargs.get("max_bytes") is not None:
+            kwargs["max_bytes"] = -(-kwargs["max_bytes"] // shards)
+        self.shards = [policy(max_items, **kwargs) for _ in range(shards)]
+        self.locks = [threading.Lock() for _ in range(shards)]
+        self.lock_free_get = policy._on_access is \
+            BaseCaching._on_access and kwargs.get("arena") is None and \
+            not kwargs.get("sample_every")
+
+    def __len__(self):
+        """
+        Return the number of items in every shard.
+        """
+        return sum(len(shard) for shard in self.shards)
+
+    def _index(self, key):
+        """
+        Return the shard index of key (inlined in put and get).
+        """
+        return hash(key) % len(self.shards)
+
+    def put(self, key, item, ttl=None):
+        """
+        Add an item to the shard of key, under its lock.
+        Args:
+            key: The key under which to store the item.
+            item: The item to be stored.
+            ttl: Seconds before the item expires (never if None).
+        """
+        if key is None or item is None:
+            return
+        index = hash(key) % len(self.shards)
+        with self.locks[index]:
+            self.shards[index].put(key, item, ttl)
+
+    def get(self, key):
+        """
+        Retrieve an item from the shard of key.
+        Args:
+            key: The key of the item to retrieve.
+        Returns:
+            The item if found, otherwise None.
+        """
+        if key is None:
+            return None
+        index = hash(key) % len(self.shards)
+        shard = self.shards[index]
+        if self.lock_free_get and not shard.expires:
+            item = shard.cache_data.get(key)
+            if item is None:
+                shard.stats.misses += 1
+            else:
+                shard.stats.hits += 1
+            return item
+        with self.locks[index]:
+            return shard.get(key)
+
+    def _group(self, keys):
+        """
+        Return a dict of shard index to the list of its keys.
+        """
+        groups = {}
+        for key in keys:
+            if key is not None:
+                groups.setdefault(self._index(key), []).append(key)
+        return groups
+
+    def put_many(self, mapping, ttl=None):
+        """
+        Add several items, one put_many per shard.
+        Args:
+            mapping: A dict or (key, item) pairs.
+            ttl: Seconds before the items expire (never if None).
+        """
+        items = mapping.items() if hasattr(mapping, "items") else mapping
+        groups = {}
+        for key, item in items:
+            if key is not None:
+                groups.setdefault(self._index(key), []).append((key, item))
+        for index, group in groups.items():
+            with self.locks[index]:
+                self.shards[index].put_many(group, ttl)
+
+    def get_many(self, keys):
+        """
+        Retrieve several items, one get_many per shard.
+        Args:
+            keys: The keys of the items to retrieve.
+        Returns:
+            A dict of the keys found to their item.
+        """
+        found = {}
+        for index, group in self._group(keys).items():
+            shard = self.shards[index]
+            if self.lock_free_get and not shard.expires:
+                data = shard.cache_data
+                hits = 0
+                for key in group:
+                    item = data.get(key)
+                    if item is not None:
+                        found[key] = item
+                        hits += 1
+                shard.stats.hits += hits
+                shard.stats.misses += len(group) - hits
+                continue
+            with self.locks[index]:
+                found.update(shard.get_many(group))
+        return found
+
+    def print_cache(self, limit=None, file=None):
+        """
+        Print the items of every shard, shard after shard.
+        Args:
+            limit: maximum number of items to print (all if None).
+            file: stream to write to (sys.stdout if None).
+        """
+        file = sys.stdout if file is None else file
+        print("Current cache:", file=file)
+        left = len(self) if limit is None else limit
+        for index, shard in enumerate(self.shards):
+            with self.locks[index]:
+                items = list(islice(shard.cache_data.items(), left))
+                if shard.arena is not None:
+                    items = [(key, shard.arena.read(item))
+                             for key, item in items]
+            for key, item in items:
+                print("{}: {}".format(key, item), file=file)
+            left -= len(items)
+            if left <= 0:
+                break
+
+    def invalidate_prefix(self, prefix):
+        """
+        Remove the items whose key starts with prefix from every shard
+        (the policy needs a key separator).
+        Args:
+            prefix: Start of the keys to remove.
+        Returns:
+            The number of removed items.
+        """
+        removed = 0
+        for index, shard in enumerate(self.shards):
+            with self.locks[index]:
+                removed += shard.invalidate_prefix(prefix)
+        return removed
+
+    def dump(self, path):
+        """
+        Save every shard, shard i to path.i.
+        Args:
+            path: Prefix of the files.
+        """
+        for index, shard in enumerate(self.shards):
+            with self.locks[index]:
+                shard.dump("{}.{}".format(path, index))
+
+    def load(self, path):
+        """
+        Restore every shard saved by dump with the same number of shards.
+        str and bytes hashes differ between processes, so the items that
+        don't belong to the shard they were dumped from any more are
+        put again, with their remaining ttl, once every shard is loaded;
+        the others keep their policy state.
+        Args:
+            path: Prefix of the files.
+        """
+        moved = []
+        for index, shard in enumerate(self.shards):
+            with self.locks[index]:
+                shard.load("{}.{}".format(path, index))
+                now = shard.clock()
+                for key in [key for key in shard.cache_data
+                            if self._index(key) != index]:
+                    item = shard.cache_data[key]
+                    if shard.arena is not None:
+                        item = shard.arena.read(item)
+                    deadline = shard.expires.get(key)
+                    moved.append((key, item, None if deadline is None
+                                  else deadline - now))
+                    shard._remove(key)
+        for key, item, ttl in moved:
+            self.put(key, item, ttl)
+
+    @property
+    def stats(self):
+        """
+        Return the counters of every shard added together.
+        """
+        total = CacheStats()
+        for shard in self.shards:
+            for name, value in vars(shard.stats).items():
+                if name == "histogram":
+                    total.histogram = [a + b for a, b in
+                                       zip(total.histogram, value)]
+                elif name != "sample_every":
+                    setattr(total, name, getattr(total, name) + value)
+        return total
@@ -0,0 +1,39 @@
+#!/usr/bin/python3
+""" 105-main """
+import asyncio
+cached = __import__('105-memoize').cached
+FIFOCache = __import__('1-fifo_cache').FIFOCache
+
+
+@cached
+def fib(n):
+    """ Fibonacci number n """
+    return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+
+@cached(policy=FIFOCache, capacity=2, ttl=60)
+async def double(n):
+    """ Twice n, slowly """
+    await asyncio.sleep(0.1)
+    return 2 * n
+
+
+class Greeter():
+    """ Greeter with a memoized method """
+    @cached(capacity=10, key=lambda args, kwargs: args[1:])
+    def greet(self, name):
+        """ Greeting for name """
+        print("computing greeting for {}".format(name))
+        return "Hello {}".format(name)
+
+
+print(fib.cache_info())
+print(fib(8))
+print(fib.cache_info())
+print(asyncio.run(double(21)))
+print(asyncio.run(double(21)))
+print(double.cache_info())
+print(Greeter().greet("Holberton"))
+print(Greeter().greet("Holberton"))
+fib.cache_clear()
+print(fib.cache_info())
@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+""" cached module """
+
+import functools
+import inspect
+import threading
+import time
+LRUCache = __import__('3-lru_cache').LRUCache
+
+NONE = object()
+KWARGS = object()
+
+
+def make_key(args, kwargs):
+    """
+    Default key of a call: its positional arguments followed by its
+    keyword arguments sorted by name.
+    Args:
+        args: The positional arguments of the call.
+        kwargs: The keyword arguments of the call.
+    Returns:
+        A hashable key.
+    """
+    if kwargs:
+        return args + (KWARGS,) + tuple(sorted(kwargs.items()))
+    if len(args) == 1 and type(args[0]) in (int, str):
+        return args[0]
+    return args
+
+
+def cached(policy=None, capacity=None, ttl=None, key=None, **kwargs):
+    """
+    Memoize a function, a method or an async def coroutine function in
+    a caching system of the given policy.
+    Can be used as @cached or @cached(...).
+    Args:
+        policy: BaseCaching subclass storing the results (LRUCache if None).
+        capacity: maximum number of results kept (policy.MAX_ITEMS if None).
+        ttl: seconds before a result expires (never if None).
+        key: function building the cache key from (args, kwargs)
+            (make_key if None).
+        kwargs: other options of the policy (max_bytes, sizeof...);
+            discarded results are not printed unless on_discard is given.
+    Returns:
+        The decorator, or the decorated function for a bare @cached.
+    """
+    if callable(policy) and not isinstance(policy, type):
+        return cached()(policy)
+    policy = LRUCache if policy is None else policy
+    make = make_key if key is None else key
+    kwargs.setdefault("on_discard", None)
+
+    def decorator(fn):
+        """
+        Wrap fn with its own cache.
+        """
+        cache = policy(capacity, **kwargs)
+        lock = threading.Lock()
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kw):
+                """Return the cached result of the coroutine, or await it"""
+                call_key = make(args, kw)
+                result = cache.get(call_key)
+                if result is None:
+                    start = time.perf_counter()
+                    result = await fn(*args, **kw)
+                    cache.stats.record_load(time.perf_counter() - start)
+                    cache.put(call_key, NONE if result is None else result,
+                              ttl)
+                    return result
+                return None if result is NONE else result
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kw):
+                """Return the cached result of the call, or compute it"""
+                call_key = make(args, kw)
+                with lock:
+                    result = cache.get(call_key)
+                if result is None:
+                    start = time.perf_counter()
+                    result = fn(*args, **kw)
+                    with lock:
+                        cache.stats.record_load(time.perf_counter() - start)
+                        cache.put(call_key,
+                                  NONE if result is None else result, ttl)
+                    return result
+                return None if result is NONE else result
+
+        def cache_info():
+            """Counters of the cache of this function"""
+            info = cache.stats.as_dict()
+            info["size"] = len(cache)
+            return info
+
+        def cache_clear():
+            """Drop every cached result and reset the counters"""
+            with lock:
+                cache.clear()
+                cache.stats.reset()
+
+        wrapper.cache = cache
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
@@ -0,0 +1,21 @@
+#!/usr/bin/python3
+""" 106-main """
+import sys
+simulator = __import__('106-simulator')
+
+KEYS, LENGTH, CAPACITY = 2000, 20000, 200
+
+traces = {
+    "zipf": simulator.zipf_trace(KEYS, LENGTH),
+    "loop": simulator.loop_trace(CAPACITY + 50, LENGTH),
+    "scan": simulator.scan_trace(KEYS, LENGTH, scan=CAPACITY),
+    "mixed": simulator.mixed_trace(KEYS, LENGTH),
+}
+if len(sys.argv) > 1:
+    traces["recorded"] = simulator.load_trace(sys.argv[1])
+
+simulator.benchmark(traces, CAPACITY)
+
+mrc = simulator.lru_miss_ratio_curve(traces["zipf"])
+for size in (10, 50, 100, 200, 500, 1000, len(mrc) - 1):
+    print("LRU miss ratio with {} items: {:.3f}".format(size, mrc[size]))
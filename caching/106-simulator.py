@@ -0,0 +1,186 @@
+#!/usr/bin/python3
+""" Trace-driven cache simulator """
+
+import itertools
+import random
+import time
+import tracemalloc
+
+POLICIES = {
+    "FIFO": __import__('1-fifo_cache').FIFOCache,
+    "LIFO": __import__('2-lifo_cache').LIFOCache,
+    "LRU": __import__('3-lru_cache').LRUCache,
+    "MRU": __import__('4-mru_cache').MRUCache,
+    "LFU": __import__('100-lfu_cache').LFUCache,
+    "ARC": __import__('101-arc_cache').ARCCache,
+    "W-TinyLFU": __import__('102-tinylfu_cache').WTinyLFUCache,
+    "CLOCK": __import__('107-clock_cache').ClockCache,
+    "CLOCK-Pro": __import__('107-clock_cache').ClockProCache,
+}
+
+
+def zipf_trace(keys, length, skew=1.0, seed=0):
+    """
+    Keys drawn from a Zipf distribution: key i has weight 1 / i ** skew.
+    Args:
+        keys: number of distinct keys.
+        length: number of accesses.
+        skew: exponent of the distribution.
+        seed: seed of the random generator.
+    Returns:
+        The list of accessed keys.
+    """
+    weights = itertools.accumulate(1 / i ** skew for i in range(1, keys + 1))
+    return random.Random(seed).choices(range(keys), cum_weights=list(weights),
+                                       k=length)
+
+
+def loop_trace(keys, length):
+    """
+    Keys 0 to keys - 1 accessed over and over in the same order.
+    """
+    return [i % keys for i in range(length)]
+
+
+def scan_trace(keys, length, scan=None, seed=0):
+    """
+    A Zipf working set of keys interrupted by sequential scans of
+    never seen keys, one scan of `scan` keys (keys if None) every
+    4 * scan accesses.
+    """
+    scan = keys if scan is None else scan
+    hot = zipf_trace(keys, length, seed=seed)
+    trace, fresh = [], keys
+    for start in range(0, length, 4 * scan):
+        trace.extend(hot[start:start + 3 * scan])
+        trace.extend(range(fresh, fresh + scan))
+        fresh += scan
+    return trace[:length]
+
+
+def mixed_trace(keys, length, seed=0):
+    """
+    A quarter of each kind of trace: zipf, loop, scan, then zipf again
+    with another seed, so the working set moves.
+    """
+    part = length // 4
+    return (zipf_trace(keys, part, seed=seed) + loop_trace(keys, part) +
+            scan_trace(keys, part, seed=seed) +
+            zipf_trace(keys, length - 3 * part, seed=seed + 1))
+
+
+def load_trace(path):
+    """
+    Recorded trace, one key per line.
+    """
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def replay(policy, trace, capacity):
+    """
+    Replay a trace through a new cache: every get missing its key is
+    followed by a put of the key.
+    Returns:
+        A dictionary with ops_per_sec, hit_ratio and peak_bytes
+        (peak memory allocated during a second, traced replay).
+    """
+    def run(cache):
+        """
+        Replay the trace, returning the number of hits.
+        """
+        hits = 0
+        for key in trace:
+            if cache.get(key) is None:
+                cache.put(key, key)
+            else:
+                hits += 1
+        return hits
+
+    cache = policy(capacity, on_discard=None)
+    start = time.perf_counter()
+    hits = run(cache)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    run(policy(capacity, on_discard=None))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "ops_per_sec": len(trace) / elapsed if elapsed else 0.0,
+        "hit_ratio": hits / len(trace) if trace else 0.0,
+        "peak_bytes": peak,
+    }
+
+
+def lru_miss_ratio_curve(trace):
+    """
+    LRU miss ratio for every cache size in one pass (Mattson's stack
+    algorithm): an access hits in an LRU cache of size c iff fewer
+    than c distinct keys were accessed since the previous access to
+    the same key. That number is counted with a Fenwick tree holding
+    a 1 at the position of the last access of every key, so the whole
+    curve costs O(n log n).
+    Returns:
+        A list mrc where mrc[c] is the miss ratio of an LRU cache of
+        c items, for c from 0 to the number of distinct keys.
+    """
+    size = len(trace)
+    tree = [0] * (size + 1)
+    last = {}
+    distances = [0] * (size + 1)
+
+    def add(pos, delta):
+        """
+        Add delta at position pos.
+        """
+        pos += 1
+        while pos <= size:
+            tree[pos] += delta
+            pos += pos & -pos
+
+    def prefix(pos):
+        """
+        Return the sum of the positions before pos.
+        """
+        total = 0
+        while pos > 0:
+            total += tree[pos]
+            pos -= pos & -pos
+        return total
+
+    for now, key in enumerate(trace):
+        before = last.get(key)
+        if before is not None:
+            distances[prefix(now) - prefix(before + 1)] += 1
+            add(before, -1)
+        add(now, 1)
+        last[key] = now
+    mrc, misses = [], size
+    for capacity in range(len(last) + 1):
+        mrc.append(misses / size if size else 0.0)
+        misses -= distances[capacity]
+    return mrc
+
+
+def benchmark(traces, capacity, policies=None):
+    """
+    Replay every trace through every policy and print one line each.
+    Args:
+        traces: dictionary of trace name to list of keys.
+        capacity: number of items of every cache.
+        policies: dictionary of policy name to class (POLICIES if None).
+    Returns:
+        The results, as a dictionary of (trace, policy) to replay().
+    """
+    policies = POLICIES if policies is None else policies
+    results = {}
+    print("{:<8} {:<10} {:>12} {:>9} {:>11}".format(
+        "trace", "policy", "ops/sec", "hit ratio", "peak KiB"))
+    for trace_name, trace in traces.items():
+        for name, policy in policies.items():
+            result = replay(policy, trace, capacity)
+            results[trace_name, name] = result
+            print("{:<8} {:<10} {:>12.0f} {:>9.3f} {:>11.1f}".format(
+                trace_name, name, result["ops_per_sec"],
+                result["hit_ratio"], result["peak_bytes"] / 1024))
+    return results
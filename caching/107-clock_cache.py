@@ -0,0 +1,336 @@
+#!/usr/bin/python3
+""" ClockCache and ClockProCache module """
+
+from array import array
+from base_caching import BaseCaching
+
+EMPTY, HOT, COLD, GHOST = 0, 1, 2, 3
+
+
+class ClockCache(BaseCaching):
+    """
+    ClockCache is a caching system that inherits from BaseCaching.
+    It implements CLOCK, an approximation of LRU:
+    keys sit in a ring of max_items slots with one reference bit each,
+    a get only sets the bit of its key, and to discard an item a hand
+    walks the ring, clearing set bits, until it finds a clear one.
+
+    The ring is a list of keys plus a bytearray of reference bits and
+    an array of free slots, and cache_data is a plain dict, so there is
+    no linked list node nor any reordering per item.
+    """
+    def __init__(self, max_items=None, **kwargs):
+        """
+        Initialize the cache.
+        Args:
+            max_items: capacity of this instance (MAX_ITEMS if None).
+            kwargs: other options of BaseCaching.
+        """
+        super().__init__(max_items, **kwargs)
+        self.cache_data = {}
+        self.keys = [None] * self.max_items
+        self.ref = bytearray(self.max_items)
+        self.free = array('l', range(self.max_items - 1, -1, -1))
+        self.slot = {}
+        self.hand = 0
+
+    def _on_insert(self, key):
+        """
+        Store a new key in a free slot, with a clear reference bit.
+        Args:
+            key: The key that was just stored.
+        """
+        index = self.free.pop()
+        self.keys[index] = key
+        self.slot[key] = index
+
+    def _on_access(self, key):
+        """
+        Set the reference bit of the key.
+        Args:
+            key: The key that was just read or updated.
+        """
+        self.ref[self.slot[key]] = 1
+
+    _on_update = _on_access
+
+    def _victim(self):
+        """
+        Move the hand to the next key with a clear reference bit,
+        clearing the bits it passes.
+        Returns:
+            The key to discard.
+        """
+        keys, ref, size = self.keys, self.ref, len(self.keys)
+        while True:
+            index = self.hand
+            self.hand = (index + 1) % size
+            if keys[index] is None:
+                continue
+            if ref[index]:
+                ref[index] = 0
+                continue
+            return keys[index]
+
+    def _dump_state(self):
+        """
+        Save the ring, its reference bits, the hand and the free slots
+        in the order they are reused.
+        Returns:
+            The state restored by _load_state.
+        """
+        return self.keys, bytes(self.ref), self.hand, self.free.tobytes()
+
+    def _load_state(self, state):
+        """
+        Rebuild the ring saved by _dump_state, or insert the keys again
+        if the capacity changed.
+        Args:
+            state: The state returned by _dump_state.
+        """
+        keys, ref, hand, free = state
+        if len(keys) != len(self.keys):
+            super()._load_state(state)
+            return
+        self.keys, self.ref, self.hand = keys, bytearray(ref), hand
+        self.slot = {key: index for index, key in enumerate(keys)
+                     if key is not None}
+        self.free = array('l')
+        self.free.frombytes(free)
+
+    def _on_discard(self, key):
+        """
+        Free the slot of a removed key.
+        Args:
+            key: The key that was removed from cache_data.
+        """
+        index = self.slot.pop(key)
+        self.keys[index] = None
+        self.ref[index] = 0
+        self.free.append(index)
+
+
+class ClockProCache(BaseCaching):
+    """
+    ClockProCache is a caching system that inherits from BaseCaching.
+    It implements CLOCK-Pro on a ring of 2 * max_items slots:
+    resident keys are hot or cold, and cold keys discarded during their
+    test period stay in the ring as ghosts (without their item).
+    A cold key used again during its test period becomes hot, and a
+    ghost put again comes back hot and grows the share of cold slots.
+    Three hands walk the ring: the cold hand discards cold keys, the
+    hot hand turns unused hot keys cold and the test hand drops old
+    ghosts, so one-time keys of a scan never push out the hot ones.
+
+    Like ClockCache, the metadata lives in bytearrays and a get only
+    sets a reference bit.
+    """
+    def __init__(self, max_items=None, **kwargs):
+        """
+        Initialize the cache.
+        Args:
+            max_items: capacity of this instance (MAX_ITEMS if None).
+            kwargs: other options of BaseCaching.
+        """
+        super().__init__(max_items, **kwargs)
+        self.cache_data = {}
+        size = 2 * self.max_items
+        self.keys = [None] * size
+        self.status = bytearray(size)
+        self.ref = bytearray(size)
+        self.test = bytearray(size)
+        self.free = array('l', range(size - 1, -1, -1))
+        self.slot = {}
+        self.hand_hot = self.hand_cold = self.hand_test = 0
+        self.hot = self.cold = self.ghosts = 0
+        self.cold_target = max(1, self.max_items // 2)
+
+    def _add(self, key, status, test):
+        """
+        Store key in a free slot of the ring.
+        """
+        index = self.free.pop()
+        self.keys[index] = key
+        self.status[index] = status
+        self.test[index] = test
+        self.slot[key] = index
+
+    def _free(self, index):
+        """
+        Empty the slot at index.
+        """
+        del self.slot[self.keys[index]]
+        self.keys[index] = None
+        self.status[index] = self.ref[index] = self.test[index] = EMPTY
+        self.free.append(index)
+
+    def _on_insert(self, key):
+        """
+        Store a new key as cold in its test period, or as hot if it was
+        a ghost, in which case the cold share grows.
+        Args:
+            key: The key that was just stored.
+        """
+        index = self.slot.get(key)
+        if index is None:
+            self._add(key, COLD, 1)
+            self.cold += 1
+            return
+        self._free(index)
+        self.ghosts -= 1
+        self.cold_target = max(1, min(self.cold_target + 1,
+                                      self.max_items - 1))
+        self._add(key, HOT, 0)
+        self.hot += 1
+        self._balance()
+
+    def _on_access(self, key):
+        """
+        Set the reference bit of the key.
+        Args:
+            key: The key that was just read or updated.
+        """
+        self.ref[self.slot[key]] = 1
+
+    _on_update = _on_access
+
+    def _victim(self):
+        """
+        Move the cold hand to the next cold key that wasn't used since
+        the hand last passed. Used cold keys in their test period are
+        promoted to hot, the others start a new test period.
+        Returns:
+            The key to discard.
+        """
+        status, ref, test = self.status, self.ref, self.test
+        while True:
+            if not self.cold:
+                self._run_hot_hand()
+                continue
+            index = self.hand_cold
+            self.hand_cold = (index + 1) % len(status)
+            if status[index] != COLD:
+                continue
+            if not ref[index]:
+                return self.keys[index]
+            ref[index] = 0
+            if test[index]:
+                status[index] = HOT
+                test[index] = 0
+                self.cold -= 1
+                self.hot += 1
+                self._balance()
+            else:
+                test[index] = 1
+
+    def _dump_state(self):
+        """
+        Save the ring with its bits, the hands, the counts, the cold
+        share and the free slots in the order they are reused.
+        Returns:
+            The state restored by _load_state.
+        """
+        return (self.keys, bytes(self.status), bytes(self.ref),
+                bytes(self.test), self.hand_hot, self.hand_cold,
+                self.hand_test, self.hot, self.cold, self.ghosts,
+                self.cold_target, self.free.tobytes())
+
+    def _load_state(self, state):
+        """
+        Rebuild the ring saved by _dump_state, or insert the keys again
+        in an empty ring if the capacity changed.
+        Args:
+            state: The state returned by _dump_state.
+        """
+        keys = state[0]
+        if len(keys) != len(self.keys):
+            size = len(self.keys)
+            self.keys = [None] * size
+            self.status = bytearray(size)
+            self.ref = bytearray(size)
+            self.test = bytearray(size)
+            self.free = array('l', range(size - 1, -1, -1))
+            self.slot = {}
+            self.hot = self.cold = self.ghosts = 0
+            super()._load_state(state)
+            return
+        self.keys = keys
+        self.status, self.ref, self.test = [
+            bytearray(bits) for bits in state[1:4]]
+        (self.hand_hot, self.hand_cold, self.hand_test, self.hot,
+         self.cold, self.ghosts, self.cold_target) = state[4:11]
+        self.slot = {key: index for index, key in enumerate(keys)
+                     if key is not None}
+        self.free = array('l')
+        self.free.frombytes(state[11])
+
+    def _on_discard(self, key):
+        """
+        Keep a removed cold key in its test period as a ghost, free the
+        slot of any other key.
+        Args:
+            key: The key that was removed from cache_data.
+        """
+        index = self.slot[key]
+        if self.status[index] == HOT:
+            self.hot -= 1
+            self._free(index)
+            return
+        self.cold -= 1
+        if not self.test[index]:
+            self._free(index)
+            return
+        self.status[index] = GHOST
+        self.ref[index] = 0
+        self.ghosts += 1
+        while self.ghosts > self.max_items:
+            self._run_test_hand()
+
+    def _balance(self):
+        """
+        Turn hot keys cold until hot keys fit in their share.
+        """
+        while self.hot > self.max_items - self.cold_target:
+            self._run_hot_hand()
+
+    def _run_hot_hand(self):
+        """
+        Move the hot hand until it turns one unused hot key cold,
+        ending the test period of the cold keys and ghosts it passes.
+        """
+        status, ref, test = self.status, self.ref, self.test
+        while True:
+            index = self.hand_hot
+            self.hand_hot = (index + 1) % len(status)
+            if status[index] == HOT:
+                if ref[index]:
+                    ref[index] = 0
+                    continue
+                status[index] = COLD
+                self.hot -= 1
+                self.cold += 1
+                return
+            if status[index] == COLD:
+                test[index] = 0
+            elif status[index] == GHOST:
+                self._free(index)
+                self.ghosts -= 1
+
+    def _run_test_hand(self):
+        """
+        Move the test hand until it drops one ghost, ending the test
+        period of the cold keys it passes; the cold share shrinks for
+        every test period ended without a new use.
+        """
+        status, test = self.status, self.test
+        while True:
+            index = self.hand_test
+            self.hand_test = (index + 1) % len(status)
+            if status[index] == COLD and test[index]:
+                test[index] = 0
+                self.cold_target = max(1, self.cold_target - 1)
+            elif status[index] == GHOST:
+                self._free(index)
+                self.ghosts -= 1
+                self.cold_target = max(1, self.cold_target - 1)
+                return
@@ -0,0 +1,31 @@
+#!/usr/bin/python3
+""" 108-main """
+import multiprocessing
+SharedMemoryCache = __import__('108-shm_cache').SharedMemoryCache
+
+
+def worker(name, lock, number):
+    """ Put items from another process """
+    cache = SharedMemoryCache.attach(name, lock, on_discard=None)
+    for i in range(3):
+        cache.put("{}-{}".format(number, i), "from worker {}".format(number))
+    cache.close()
+
+
+if __name__ == "__main__":
+    my_cache = SharedMemoryCache(max_items=8)
+    my_cache.put("A", "Hello")
+    print(my_cache.get("A"))
+    workers = [multiprocessing.Process(target=worker,
+                                       args=(my_cache.name, my_cache.lock, n))
+               for n in range(3)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+    print(len(my_cache))
+    print(my_cache.get("2-1"))
+    my_cache.put("B", "World")
+    my_cache.print_cache()
+    my_cache.close()
+    my_cache.unlink()
@@ -0,0 +1,346 @@
+#!/usr/bin/python3
+""" SharedMemoryCache module """
+
+import multiprocessing
+import pickle
+import struct
+import zlib
+from multiprocessing import shared_memory
+from base_caching import BaseCaching, print_discard
+from cache_stats import CacheStats
+from key_codec import decode_key, encode_key
+
+HEADER = struct.Struct("<8sIIIIII")
+SLOT = struct.Struct("<BBHII")
+MAGIC = b"HBSHMC01"
+EMPTY, USED, DELETED = 0, 1, 2
+
+
+class SharedMemoryCache():
+    """
+    SharedMemoryCache is a caching system shared by every process of a
+    host, stored in a multiprocessing.shared_memory block:
+      - a header (magic, table size, slot size, item count, deleted
+        count, CLOCK hand)
+      - a hash table of fixed-size slots with linear probing, each slot
+        holding its state, a reference bit, the key and item lengths,
+        the CRC32 of the key, then the key in the canonical encoding of
+        key_codec and the pickled item
+    Eviction is CLOCK: a get sets the reference bit of its slot and the
+    hand discards the first item whose bit is clear. The table has two
+    slots per item so probes stay short, and it is rebuilt in place
+    when deleted slots pile up.
+
+    Every operation runs under a multiprocessing lock. Create the cache
+    before the workers are forked (gunicorn --preload), or share the
+    name and the lock with attach().
+
+    Keys are str, bytes, int, float or tuples of them, so that keys
+    which compare equal are stored under the same bytes; put and get
+    raise TypeError for any other key.
+    """
+    MAX_ITEMS = BaseCaching.MAX_ITEMS
+
+    def __init__(self, max_items=None, slot_size=256, name=None,
+                 lock=None, on_discard=print_discard):
+        """
+        Create the shared memory block.
+        Args:
+            max_items: capacity (MAX_ITEMS if None).
+            slot_size: bytes per slot; an encoded key and item larger
+                than slot_size - 12 bytes are not stored.
+            name: name of the shared memory block (random if None).
+            lock: lock shared by the processes
+                (a new multiprocessing.Lock if None).
+            on_discard: listener called with (key, item) for every
+                discarded item, None for no listener.
+        """
+        max_items = self.MAX_ITEMS if max_items is None else max_items
+        slots = 2 * max_items
+        self.shm = shared_memory.SharedMemory(
+            name, create=True, size=HEADER.size + slots * slot_size)
+        HEADER.pack_into(self.shm.buf, 0, MAGIC, slots, slot_size,
+                         max_items, 0, 0, 0)
+        self._setup(lock, on_discard)
+
+    @classmethod
+    def attach(cls, name, lock, on_discard=print_discard):
+        """
+        Open a cache created by another process.
+        Args:
+            name: name of the shared memory block.
+            lock: the lock of the cache.
+            on_discard: listener of this process.
+        Returns:
+            The cache.
+        """
+        cache = cls.__new__(cls)
+        cache.shm = shared_memory.SharedMemory(name)
+        if bytes(cache.shm.buf[:len(MAGIC)]) != MAGIC:
+            raise ValueError("{} is not a SharedMemoryCache".format(name))
+        cache._setup(lock, on_discard)
+        return cache
+
+    def _setup(self, lock, on_discard):
+        """
+        Read the geometry from the header.
+        """
+        self.slots, self.slot_size, self.max_items = \
+            HEADER.unpack_from(self.shm.buf, 0)[1:4]
+        self.name = self.shm.name
+        self.lock = multiprocessing.Lock() if lock is None else lock
+        self.listeners = [] if on_discard is None else [on_discard]
+        self.stats = CacheStats()
+
+    def _counts(self):
+        """
+        Return (item count, deleted count, hand) from the header.
+        """
+        return struct.unpack_from("<III", self.shm.buf, HEADER.size - 12)
+
+    def _set_counts(self, count, deleted, hand):
+        """
+        Store the item count, deleted count and hand in the header.
+        """
+        struct.pack_into("<III", self.shm.buf, HEADER.size - 12,
+                         count, deleted, hand)
+
+    def __len__(self):
+        """
+        Return the number of items.
+        """
+        return self._counts()[0]
+
+    def _offset(self, index):
+        """
+        Return the offset of slot index in the block.
+        """
+        return HEADER.size + index * self.slot_size
+
+    def _find(self, raw_key, crc):
+        """
+        Probe the table for a key.
+        Returns:
+            (index of the key or None, first free index on the way).
+        """
+        buf, free = self.shm.buf, None
+        index = crc % self.slots
+        for _ in range(self.slots):
+            offset = self._offset(index)
+            state, _, key_len, _, slot_crc = SLOT.unpack_from(buf, offset)
+            if state == EMPTY:
+                return None, index if free is None else free
+            if state == DELETED:
+                if free is None:
+                    free = index
+            elif slot_crc == crc and key_len == len(raw_key):
+                start = offset + SLOT.size
+                if buf[start:start + key_len] == raw_key:
+                    return index, free
+            index = (index + 1) % self.slots
+        return None, free
+
+    def _read(self, index):
+        """
+        Return the decoded (key, item) of a used slot.
+        """
+        offset = self._offset(index)
+        _, _, key_len, item_len, _ = SLOT.unpack_from(self.shm.buf, offset)
+        start = offset + SLOT.size
+        data = bytes(self.shm.buf[start:start + key_len + item_len])
+        return decode_key(data[:key_len]), pickle.loads(data[key_len:])
+
+    def _write(self, index, raw_key, crc, raw_item):
+        """
+        Fill a slot.
+        """
+        offset = self._offset(index)
+        start = offset + SLOT.size
+        end = start + len(raw_key)
+        self.shm.buf[start:end] = raw_key
+        self.shm.buf[end:end + len(raw_item)] = raw_item
+        SLOT.pack_into(self.shm.buf, offset, USED, 0, len(raw_key),
+                       len(raw_item), crc)
+
+    def put(self, key, item):
+        """
+        Add an item to the cache, discarding the CLOCK victim if full.
+        If either key or item is None, or they don't fit in a slot,
+        the method does nothing.
+        Args:
+            key: The key under which to store the item.
+            item: The item to be stored.
+        """
+        if key is None or item is None:
+            return
+        raw_key = encode_key(key)
+        raw_item = pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+        if SLOT.size + len(raw_key) + len(raw_item) > self.slot_size:
+            return
+        with self.lock:
+            discarded = self._put(raw_key, raw_item)
+        self._report(discarded)
+
+    def put_many(self, mapping):
+        """
+        Add several items under a single acquisition of the lock.
+        Args:
+            mapping: A dict or (key, item) pairs.
+        """
+        items = mapping.items() if hasattr(mapping, "items") else mapping
+        raw = []
+        for key, item in items:
+            if key is None or item is None:
+                continue
+            raw_key = encode_key(key)
+            raw_item = pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+            if SLOT.size + len(raw_key) + len(raw_item) <= self.slot_size:
+                raw.append((raw_key, raw_item))
+        discarded = []
+        with self.lock:
+            for raw_key, raw_item in raw:
+                discarded.extend(self._put(raw_key, raw_item))
+        self._report(discarded)
+
+    def _put(self, raw_key, raw_item):
+        """
+        Store an encoded key and pickled item, the lock being held.
+        Returns:
+            The list of discarded (key, item).
+        """
+        crc = zlib.crc32(raw_key)
+        index, free = self._find(raw_key, crc)
+        if index is not None:
+            self._write(index, raw_key, crc, raw_item)
+            return []
+        discarded = []
+        count, deleted, hand = self._counts()
+        if count >= self.max_items:
+            discarded.append(self._evict())
+            index, free = self._find(raw_key, crc)
+            count, deleted, hand = self._counts()
+        if self.shm.buf[self._offset(free)] == DELETED:
+            deleted -= 1
+        self._write(free, raw_key, crc, raw_item)
+        self._set_counts(count + 1, deleted, hand)
+        if deleted > self.slots // 4:
+            self._rebuild()
+        return discarded
+
+    def _report(self, discarded):
+        """
+        Count the discarded items and tell the listeners.
+        """
+        self.stats.evictions += len(discarded)
+        for key, item in discarded:
+            for listener in self.listeners:
+                listener(key, item)
+
+    def get(self, key):
+        """
+        Retrieve an item from the cache by its key,
+        setting the reference bit of its slot.
+        Args:
+            key: The key of the item to retrieve.
+        Returns:
+            The item if found, otherwise None.
+        """
+        if key is None:
+            return None
+        raw_key = encode_key(key)
+        with self.lock:
+            index, _ = self._find(raw_key, zlib.crc32(raw_key))
+            if index is None:
+                self.stats.misses += 1
+                return None
+            self.shm.buf[self._offset(index) + 1] = 1
+            item = self._read(index)[1]
+        self.stats.hits += 1
+        return item
+
+    def get_many(self, keys):
+        """
+        Retrieve several items under a single acquisition of the lock.
+        Args:
+            keys: The keys of the items to retrieve.
+        Returns:
+            A dict of the keys found to their item.
+        """
+        raw = [(key, encode_key(key))
+               for key in keys if key is not None]
+        found = {}
+        with self.lock:
+            for key, raw_key in raw:
+                index, _ = self._find(raw_key, zlib.crc32(raw_key))
+                if index is not None:
+                    self.shm.buf[self._offset(index) + 1] = 1
+                    found[key] = self._read(index)[1]
+        self.stats.hits += len(found)
+        self.stats.misses += len(raw) - len(found)
+        return found
+
+    def _evict(self):
+        """
+        Move the hand to the first used slot with a clear reference bit,
+        clearing the bits it passes, and delete its item.
+        Returns:
+            The discarded (key, item).
+        """
+        buf = self.shm.buf
+        count, deleted, hand = self._counts()
+        while True:
+            offset = self._offset(hand)
+            index, hand = hand, (hand + 1) % self.slots
+            if buf[offset] != USED:
+                continue
+            if buf[offset + 1]:
+                buf[offset + 1] = 0
+                continue
+            discarded = self._read(index)
+            buf[offset] = DELETED
+            self._set_counts(count - 1, deleted + 1, hand)
+            return discarded
+
+    def _rebuild(self):
+        """
+        Insert every item again in an emptied table to get rid of the
+        deleted slots. Reference bits are kept.
+        """
+        buf, entries = self.shm.buf, []
+        for index in range(self.slots):
+            offset = self._offset(index)
+            state, ref, key_len, item_len, crc = SLOT.unpack_from(buf, offset)
+            if state == USED:
+                start = offset + SLOT.size
+                entries.append((ref, crc, bytes(
+                    buf[start:start + key_len]), bytes(
+                    buf[start + key_len:start + key_len + item_len])))
+            buf[offset] = EMPTY
+        for ref, crc, raw_key, raw_item in entries:
+            _, free = self._find(raw_key, crc)
+            self._write(free, raw_key, crc, raw_item)
+            buf[self._offset(free) + 1] = ref
+        self._set_counts(len(entries), 0, 0)
+
+    def print_cache(self):
+        """
+        Print the items in slot order.
+        """
+        print("Current cache:")
+        with self.lock:
+            items = [self._read(index) for index in range(self.slots)
+                     if self.shm.buf[self._offset(index)] == USED]
+        for key, item in items:
+            print("{}: {}".format(key, item))
+
+    def close(self):
+        """
+        Detach this process from the shared memory block.
+        """
+        self.shm.close()
+
+    def unlink(self):
+        """
+        Destroy the shared memory block (call once, in the creator).
+        """
+        self.shm.unlink()
@@ -0,0 +1,23 @@
+#!/usr/bin/python3
+""" 109-main (needs a Redis server on localhost) """
+import sys
+sys.path.append("../0x0B_redis_basic")
+Cache = __import__('exercise').Cache
+TieredCache = __import__('109-tiered_cache').TieredCache
+LRUCache = __import__('3-lru_cache').LRUCache
+
+my_cache = TieredCache(LRUCache(2), Cache(), l1_ttl=10, l2_ttl=60)
+my_cache.put("A", "Hello")
+my_cache.put("B", "World")
+my_cache.put("C", "Holberton")
+print(my_cache.get("A"))
+print(my_cache.get("C"))
+print(my_cache.get("D"))
+print({tier: stats.as_dict() for tier, stats in my_cache.stats.items()})
+
+my_cache = TieredCache(LRUCache(2), Cache(), write_behind=True)
+my_cache.put("A", "Hello")
+my_cache.put("A", "Street")
+print(my_cache.flush())
+print(my_cache.get("A"))
+my_cache.close()
@@ -0,0 +1,213 @@
+#!/usr/bin/python3
+""" TieredCache module """
+
+import pickle
+import threading
+from cache_stats import CacheStats
+from key_codec import encode_key
+
+
+class TieredCache():
+    """
+    TieredCache puts a bounded in-process caching system (L1, any
+    BaseCaching instance) in front of the Redis Cache of
+    0x0B_redis_basic/exercise.py (L2):
+      - get reads L1, then L2, and promotes L2 hits into L1
+      - put writes L1, and L2 either at once (write-through) or from
+        a background thread that flushes the pending writes in batches
+        every flush_interval seconds (write-behind); several writes of
+        one key before a flush only send the last one
+    Each tier has its own ttl, and its own CacheStats counting hits,
+    misses and promotions. Items are pickled for L2, under the prefix
+    followed by the canonical encoding of their key (key_codec), so 1
+    and "1" are different L2 keys; put and get raise TypeError for keys
+    encode_key doesn't support.
+    get_many/put_many and write-behind flushes reach L2 in a single
+    round trip (MGET, MSET or a pipeline). A flush that fails keeps its
+    writes pending for the next one, and is counted in flush_errors.
+    """
+    def __init__(self, l1, l2, l1_ttl=None, l2_ttl=None,
+                 write_behind=False, flush_interval=0.1, prefix=""):
+        """
+        Initialize the tiers.
+        Args:
+            l1: BaseCaching instance.
+            l2: exercise.Cache instance (Redis).
+            l1_ttl: seconds an item stays in L1 (no expiry if None).
+            l2_ttl: seconds an item stays in L2 (no expiry if None).
+            write_behind: write L2 from a background thread.
+            flush_interval: seconds between two write-behind flushes.
+            prefix: prefix of the L2 keys (str or bytes).
+        """
+        self.l1 = l1
+        self.l2 = l2
+        self.l1_ttl = l1_ttl
+        self.l2_ttl = l2_ttl
+        self.prefix = prefix.encode() if isinstance(prefix, str) else prefix
+        self.stats = {"l1": CacheStats(), "l2": CacheStats()}
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.flush_errors = 0
+        self.last_flush_error = None
+        self.flusher = None
+        if write_behind:
+            self.flush_interval = flush_interval
+            self.stopped = threading.Event()
+            self.flusher = threading.Thread(target=self._flush_loop,
+                                            daemon=True)
+            self.flusher.start()
+
+    def put(self, key, item):
+        """
+        Add an item to both tiers.
+        Args:
+            key: The key under which to store the item.
+            item: The item to be stored.
+        """
+        if key is None or item is None:
+            return
+        l2_key = self._l2_key(key)
+        data = pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            self.l1.put(key, item, self.l1_ttl)
+            if self.flusher is not None:
+                self.pending[key] = data
+                return
+        self.l2.put(l2_key, data, self.l2_ttl)
+
+    def _l2_key(self, key):
+        """
+        Return the L2 key of key.
+        """
+        return self.prefix + encode_key(key)
+
+    def get(self, key):
+        """
+        Retrieve an item from L1, or from L2 (promoting it into L1).
+        Args:
+            key: The key of the item to retrieve.
+        Returns:
+            The item if found in a tier, otherwise None.
+        """
+        if key is None:
+            return None
+        l1, l2 = self.stats["l1"], self.stats["l2"]
+        with self.lock:
+            item = self.l1.get(key)
+            data = None if item is not None else self.pending.get(key)
+        if item is not None:
+            l1.hits += 1
+            return item
+        l1.misses += 1
+        if data is None:
+            data = self.l2.get(self._l2_key(key))
+        if data is None:
+            l2.misses += 1
+            return None
+        l2.hits += 1
+        item = pickle.loads(data)
+        with self.lock:
+            self.l1.put(key, item, self.l1_ttl)
+        l2.promotions += 1
+        return item
+
+    def put_many(self, mapping, ttl=None):
+        """
+        Add several items to both tiers, with one L2 round trip.
+        Args:
+            mapping: A dict or (key, item) pairs.
+            ttl: Ignored, each tier uses its own ttl.
+        """
+        items = mapping.items() if hasattr(mapping, "items") else mapping
+        items = {key: item for key, item in items
+                 if key is not None and item is not None}
+        l2_keys = {key: self._l2_key(key) for key in items}
+        data = {key: pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+                for key, item in items.items()}
+        with self.lock:
+            self.l1.put_many(items, self.l1_ttl)
+            if self.flusher is not None:
+                self.pending.update(data)
+                return
+        self._write({l2_keys[key]: value for key, value in data.items()})
+
+    def get_many(self, keys):
+        """
+        Retrieve several items: L1 first, then every L1 miss from L2 in
+        one round trip, promoting the L2 hits into L1 together.
+        Args:
+            keys: The keys of the items to retrieve.
+        Returns:
+            A dict of the keys found to their item.
+        """
+        keys = [key for key in keys if key is not None]
+        l1, l2 = self.stats["l1"], self.stats["l2"]
+        with self.lock:
+            found = self.l1.get_many(keys)
+            missing = [key for key in dict.fromkeys(keys)
+                       if key not in found]
+            data = {key: self.pending[key] for key in missing
+                    if key in self.pending}
+        l1.hits += len(found)
+        l1.misses += len(missing)
+        remote = [key for key in missing if key not in data]
+        if remote:
+            values = self.l2.get_many([self._l2_key(key) for key in remote])
+            data.update((key, value) for key, value in zip(remote, values)
+                        if value is not None)
+        promoted = {key: pickle.loads(value) for key, value in data.items()}
+        l2.hits += len(promoted)
+        l2.misses += len(missing) - len(promoted)
+        if promoted:
+            with self.lock:
+                self.l1.put_many(promoted, self.l1_ttl)
+            l2.promotions += len(promoted)
+            found.update(promoted)
+        return found
+
+    def _write(self, data):
+        """
+        Write a dict of L2 key to pickled item to L2 in one round trip.
+        """
+        self.l2.put_many(data, self.l2_ttl)
+
+    def flush(self):
+        """
+        Send the pending write-behind writes to L2 in one round trip.
+        If L2 fails, the writes go back to pending, behind any newer
+        write of the same keys, and the error is counted.
+        Returns:
+            The number of items written (0 if L2 failed).
+        """
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        if not pending:
+            return 0
+        try:
+            self._write({self._l2_key(key): value
+                         for key, value in pending.items()})
+        except Exception as error:
+            with self.lock:
+                pending.update(self.pending)
+                self.pending = pending
+                self.flush_errors += 1
+                self.last_flush_error = error
+            return 0
+        return len(pending)
+
+    def _flush_loop(self):
+        """
+        Flush every flush_interval seconds until close.
+        """
+        while not self.stopped.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        """
+        Stop the write-behind thread after a last flush.
+        """
+        if self.flusher is not None:
+            self.stopped.set()
+            self.flusher.join()
+            self.flusher = None
+        self.flush()
@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+""" AsyncCache module """
+
+import asyncio
+
+
+class AsyncCache():
+    """
+    AsyncCache is an asyncio front for a caching system of any
+    BaseCaching policy.
+
+    Everything runs on the event loop thread, so no threading lock is
+    ever taken and the loop never blocks on one. get_or_load awaits a
+    coroutine loader; coroutines missing the same key at the same time
+    share one in-flight future and a single call of the loader.
+
+    A caller cancelled (or timed out) while waiting doesn't cancel the
+    shared load, the other waiters still get its result. A load that is
+    itself cancelled, by aclose or by the loop shutting down, wakes its
+    waiters with CancelledError and leaves nothing behind, so the next
+    miss starts a new load.
+    """
+    def __init__(self, policy, max_items=None, timeout=None, **kwargs):
+        """
+        Initialize the cache.
+        Args:
+            policy: BaseCaching subclass storing the items.
+            max_items: capacity (policy.MAX_ITEMS if None).
+            timeout: default seconds a caller waits for a load
+                (no limit if None).
+            kwargs: other options of the policy.
+        """
+        self.cache = policy(max_items, **kwargs)
+        self.timeout = timeout
+
+    def __len__(self):
+        """
+        Return the number of items.
+        """
+        return len(self.cache)
+
+    async def __aenter__(self):
+        """
+        Return the cache itself.
+        """
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """
+        Close the cache.
+        """
+        await self.aclose()
+
+    @property
+    def stats(self):
+        """
+        Return the CacheStats of the cache.
+        """
+        return self.cache.stats
+
+    def put(self, key, item, ttl=None):
+        """
+        Add an item, expiring after ttl seconds if given.
+        """
+        self.cache.put(key, item, ttl)
+
+    def get(self, key):
+        """
+        Return the item of key, None if it is missing.
+        """
+        return self.cache.get(key)
+
+    def put_many(self, mapping, ttl=None):
+        """
+        Add several items, expiring after ttl seconds if given.
+        """
+        self.cache.put_many(mapping, ttl)
+
+    def get_many(self, keys):
+        """
+        Return a dict of the keys found to their item.
+        """
+        return self.cache.get_many(keys)
+
+    def discard(self, key):
+        """
+        Remove the item of key.
+        """
+        return self.cache.discard(key)
+
+    async def get_or_load(self, key, loader, ttl=None, negative_ttl=None,
+                          refresh_ahead=None, timeout=None):
+        """
+        Return the item of key, awaiting loader(key) on a miss.
+        Args:
+            key: The key of the item.
+            loader: async function returning the item of a key.
+            ttl: Seconds before a loaded item expires (never if None).
+            negative_ttl: Seconds a None result is remembered.
+            refresh_ahead: Fraction of ttl after which a hit reloads
+                the item in the background.
+            timeout: Seconds to wait for the load (self.timeout if None),
+                asyncio.TimeoutError is raised but the load goes on.
+        Returns:
+            The item, or None if the loader found nothing.
+        """
+        load = self.cache.get_or_load_async(key, loader, ttl, negative_ttl,
+                                            refresh_ahead)
+        if timeout is None:
+            timeout = self.timeout
+        if timeout is None:
+            return await load
+        return await asyncio.wait_for(load, timeout)
+
+    def loading(self):
+        """
+        Return the number of loads in flight.
+        """
+        return len(self.cache.async_flights)
+
+    async def aclose(self):
+        """
+        Cancel the loads in flight and wait for them to finish.
+        """
+        tasks = [future.task for future in self.cache.async_flights.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,30 @@
+#!/usr/bin/python3
+""" 110-main """
+import asyncio
+AsyncCache = __import__('110-async_cache').AsyncCache
+LRUCache = __import__('3-lru_cache').LRUCache
+
+
+async def fetch(key):
+    """ Item of key, slowly """
+    print("fetching {}".format(key))
+    await asyncio.sleep(0.1)
+    return "item {}".format(key)
+
+
+async def main():
+    """ Share loads, time out and close """
+    async with AsyncCache(LRUCache, 2) as my_cache:
+        print(await asyncio.gather(*(my_cache.get_or_load("A", fetch, ttl=60)
+                                     for _ in range(3))))
+        try:
+            await my_cache.get_or_load("B", fetch, timeout=0.01)
+        except asyncio.TimeoutError:
+            print("timed out, {} load in flight".format(my_cache.loading()))
+        print(await my_cache.get_or_load("B", fetch))
+        my_cache.put("C", "Holberton")
+        print(my_cache.get("A"))
+        print(my_cache.stats.as_dict())
+
+
+asyncio.run(main())
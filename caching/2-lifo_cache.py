@@ -11,42 +11,18 @@ class LIFOCache(BaseCaching):
     when the cache exceeds the maximum number of items,
     the most recently added item is discarded.
     """
-    def __init__(self):
+    def _on_update(self, key):
         """
-        Initialize the cache.
-        Calls the parent constructor and
-        initializes a list to track insertion order.
-        """
-        super().__init__()
-        self.key_save = []
-
-    def put(self, key, item):
-        """
-        Add an item to the cache.
-        If the cache exceeds the max size,
-        discard the most recently added item (LIFO).
+        An updated key counts as the last one put in.
         Args:
-            key: The key under which to store the item.
-            item: The item to be stored.
+            key: The key that received a new item.
         """
-        if key is None or item is None:
-            return
-        if len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-            last_key = self.key_save.pop()
-            del self.cache_data[last_key]
-            print(f"DISCARD: {last_key}")
-        self.key_save.append(key)
-        self.cache_data[key] = item
+        self.cache_data.move_to_end(key)
 
-    def get(self, key):
+    def _victim(self):
         """
-        Retrieve an item from the cache by its key.
-        If the key is None or not found, return None.
-        Args:
-            key: The key of the item to retrieve.
+        Return the most recently added key (LIFO).
         Returns:
-            The item if found, otherwise None.
+            The key at the back of cache_data.
         """
-        if key is None or key not in self.cache_data:
-            return None
-        return self.cache_data.get(key)
+        return next(reversed(self.cache_data))
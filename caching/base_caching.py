@@ -1,32 +1,575 @@
 #!/usr/bin/python3
 """ BaseCaching module
 """
+import asyncio
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+from cache_stats import CacheStats
+from key_trie import KeyTrie
+from single_flight import Flight
+from timer_wheel import TimerWheel
+
+MISSING = object()
+DUMP_FORMAT = 1
+DUMP_BATCH = 4096
+
+
+def print_discard(key, item):
+    """ Default discard listener, print the discarded key
+    """
+    print("DISCARD: {}".format(key))
+
 
 class BaseCaching():
     """ BaseCaching defines:
       - constants of your caching system
       - where your data are stored (in a dictionary)
+      - the ordering engine shared by every eviction policy
+
+    `cache_data` is an OrderedDict: besides holding the items it keeps
+    the keys in a policy-defined order, so moving a key to either end,
+    finding the oldest/newest key and deleting any key are all O(1).
+    Policies only decide which end to touch through the hooks below.
+
+    A cache can also be given a byte budget: the size of every item is
+    measured once by `sizeof` when it is put, and the running total
+    `total_bytes` is kept up to date on put and discard.
+
+    Items put with a ttl expire: a get never returns an expired item,
+    and a TimerWheel lets `expire` reclaim due keys without scanning
+    cache_data. `expire` runs at the start of every put.
+
+    Discarded items are reported to the `listeners` (print_discard by
+    default, none with on_discard=None) and every operation is counted
+    in `stats`.
+
+    With an `arena` (value_arena.SlabArena), items must be bytes-like:
+    they are copied into the arena, cache_data only holds integer
+    handles and get returns a zero-copy memoryview, valid until the
+    key is updated or discarded. Policies only see keys, so they work
+    the same way.
+
+    `dump` streams the items, in policy order, with their remaining ttl
+    and the policy state (`_dump_state`) to a file that `load` restores.
+
+    With a key `separator`, keys are also indexed in a KeyTrie so that
+    `invalidate_prefix` only visits the keys it removes.
+
+    `get_or_load` (threads) and `get_or_load_async` (asyncio) read
+    through to a loader on a miss, with a single call of the loader per
+    key however many callers miss it at the same time.
     """
     MAX_ITEMS = 4
 
-    def __init__(self):
+    def __init__(self, max_items=None, max_bytes=None, sizeof=None,
+                 on_discard=print_discard, sample_every=0, arena=None,
+                 separator=None):
         """ Initiliaze
+        Args:
+            max_items: capacity of this instance (MAX_ITEMS if None).
+            max_bytes: optional budget for the total size of the items,
+                enforced on top of max_items.
+            sizeof: size estimator called with each item
+                (sys.getsizeof if None). Sizes are only tracked when
+                max_bytes or sizeof is given.
+            on_discard: listener called with (key, item) for every
+                discarded item, None for no listener.
+            sample_every: time one get out of sample_every in the
+                stats latency histogram (no timing if 0).
+            arena: SlabArena storing the items serialized (items are
+                stored as they are if None). sizeof defaults to len.
+            separator: separator of the key segments, to index keys
+                for invalidate_prefix (no index if None).
+        """
+        self.max_items = self.MAX_ITEMS if max_items is None else max_items
+        self.max_bytes = max_bytes
+        self.cache_data = OrderedDict()
+        self.total_bytes = 0
+        if max_bytes is None and sizeof is None:
+            self.sizes = None
+        else:
+            self.sizes = {}
+            self.sizeof = sizeof or (len if arena else sys.getsizeof)
+        self.arena = arena
+        self.trie = None if separator is None else KeyTrie(separator)
+        self.clock = time.monotonic
+        self.expires = {}
+        self.wheel = None
+        self.listeners = [] if on_discard is None else [on_discard]
+        self.lock = threading.Lock()
+        self.flights = {}
+        self.async_flights = {}
+        self.negatives = {}
+        self.stats = CacheStats(sample_every)
+        if sample_every:
+            self.sampled = 0
+            self.get = self._sampled_get
+
+    def __len__(self):
+        """ Number of items currently cached
         """
-        self.cache_data = {}
+        return len(self.cache_data)
 
-    def print_cache(self):
+    def print_cache(self, limit=None, file=None):
         """ Print the cache
+        Items are written one by one in the policy order, so nothing is
+        sorted or copied. At most limit items are printed if given.
         """
-        print("Current cache:")
-        for key in sorted(self.cache_data.keys()):
-            print("{}: {}".format(key, self.cache_data.get(key)))
+        file = sys.stdout if file is None else file
+        print("Current cache:", file=file)
+        for key, item in islice(self.cache_data.items(), limit):
+            if self.arena is not None:
+                item = self.arena.read(item)
+            print("{}: {}".format(key, item), file=file)
+        if limit is not None and len(self.cache_data) > limit:
+            print("... {} more".format(len(self.cache_data) - limit),
+                  file=file)
 
-    def put(self, key, item):
+    def add_listener(self, listener):
+        """ Call listener with (key, item) for every discarded item
+        """
+        self.listeners.append(listener)
+
+    def put(self, key, item, ttl=None):
         """ Add an item in the cache
+        If key or item is None, this method does nothing.
+        An existing key is updated in place, otherwise items are
+        discarded (through `_victim`) until there is room for it.
+        An item bigger than the whole byte budget is not stored.
+        The item expires after ttl seconds, or never if ttl is None.
+        """
+        if key is None or item is None:
+            return
+        if self.expires:
+            self.expire()
+        self._put(key, item, ttl)
+
+    def put_many(self, mapping, ttl=None):
+        """ Add several items (a dict or (key, item) pairs) in the cache
+        Each item is added as put would add it, in order, so every
+        policy discards the same items as a sequence of put; expired
+        items are only removed once, before the batch.
         """
-        raise NotImplementedError("put must be implemented in your cache class")
+        if self.expires:
+            self.expire()
+        items = mapping.items() if hasattr(mapping, "items") else mapping
+        for key, item in items:
+            if key is not None and item is not None:
+                self._put(key, item, ttl)
+
+    def _put(self, key, item, ttl):
+        """ Add an item once expired items are removed
+        """
+        size = 0 if self.sizes is None else self.sizeof(item)
+        if key in self.cache_data:
+            self._update(key, item, size)
+            self._make_room(0, 0)
+        else:
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._make_room(1, size)
+            self._insert(key, item, size)
+        if (ttl is not None or key in self.expires) and \
+                key in self.cache_data:
+            self._set_ttl(key, ttl)
+
+    def _update(self, key, item, size):
+        """ Replace the item of an existing key
+        """
+        if self.arena is not None:
+            self.arena.free(self.cache_data[key])
+            item = self.arena.store(item)
+        self.cache_data[key] = item
+        if self.sizes is not None:
+            self.total_bytes += size - self.sizes[key]
+            self.sizes[key] = size
+        self._on_update(key)
+
+    def _insert(self, key, item, size):
+        """ Store a new key, once there is room for it
+        """
+        if self.arena is not None:
+            item = self.arena.store(item)
+        self.cache_data[key] = item
+        if self.sizes is not None:
+            self.sizes[key] = size
+            self.total_bytes += size
+        if self.trie is not None:
+            self.trie.add(key)
+        self._on_insert(key)
 
     def get(self, key):
         """ Get an item by key
+        Return None if key is None or doesn't exist.
+        """
+        if key is None:
+            return None
+        item = self.cache_data.get(key)
+        if item is None:
+            self.stats.misses += 1
+            return None
+        if self.expires:
+            deadline = self.expires.get(key)
+            if deadline is not None and deadline <= self.clock():
+                self._remove(key)
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+        self.stats.hits += 1
+        self._on_access(key)
+        if self.arena is not None:
+            return self.arena.view(item)
+        return item
+
+    def get_many(self, keys):
+        """ Get several items at once
+        Return a dict of the keys found (expired items excluded) to
+        their item. The clock is read once for the whole batch.
+        """
+        data, expires, arena = self.cache_data, self.expires, self.arena
+        now = self.clock() if expires else None
+        found, expired, lookups = {}, {}, 0
+        for key in keys:
+            lookups += 1
+            item = data.get(key) if key is not None else None
+            if item is None or key in expired:
+                continue
+            if expires:
+                deadline = expires.get(key)
+                if deadline is not None and deadline <= now:
+                    expired[key] = None
+                    continue
+            self._on_access(key)
+            found[key] = item if arena is None else arena.view(item)
+        for key in expired:
+            self._remove(key)
+        self.stats.expirations += len(expired)
+        self.stats.hits += len(found)
+        self.stats.misses += lookups - len(found)
+        return found
+
+    def _sampled_get(self, key):
+        """ get, timing one call out of stats.sample_every
+        """
+        self.sampled += 1
+        if self.sampled < self.stats.sample_every:
+            return type(self).get(self, key)
+        self.sampled = 0
+        start = time.perf_counter_ns()
+        item = type(self).get(self, key)
+        self.stats.record_latency(time.perf_counter_ns() - start)
+        return item
+
+    def _set_ttl(self, key, ttl):
+        """ Make key expire in ttl seconds, or never if ttl is None
+        """
+        if ttl is None:
+            del self.expires[key]
+            self.wheel.cancel(key)
+            return
+        now = self.clock()
+        if self.wheel is None:
+            self.wheel = TimerWheel(now)
+        self.expires[key] = now + ttl
+        self.wheel.schedule(key, now + ttl)
+
+    def expire(self):
+        """ Remove every expired item
+        Return the number of removed items.
+        """
+        if self.wheel is None:
+            return 0
+        due = self.wheel.advance(self.clock())
+        for key in due:
+            self._remove(key)
+        self.stats.expirations += len(due)
+        return len(due)
+
+    def get_or_load(self, key, loader, ttl=None, negative_ttl=None,
+                    refresh_ahead=None):
+        """ Get an item by key, loading it with loader(key) on a miss
+        Threads missing the same key at the same time wait for a single
+        call of loader and all get its result (or its exception).
+        The item is put with ttl. A None result is remembered for
+        negative_ttl seconds if given, so missing keys aren't reloaded
+        on every call. With refresh_ahead (a fraction of ttl), a hit on
+        an item older than refresh_ahead * ttl returns it and reloads
+        it in a background thread.
+        """
+        with self.lock:
+            item, refresh = self._lookup(key, ttl, refresh_ahead,
+                                         self.flights)
+            if item is not MISSING and not refresh:
+                return item
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = Flight()
+        if item is not MISSING:
+            threading.Thread(target=self._load, daemon=True,
+                             args=(key, loader, ttl, negative_ttl,
+                                   flight)).start()
+            return item
+        if leader:
+            self._load(key, loader, ttl, negative_ttl, flight)
+        return flight.wait()
+
+    async def get_or_load_async(self, key, loader, ttl=None,
+                                negative_ttl=None, refresh_ahead=None):
+        """ Coroutine version of get_or_load for an async def loader
+        The loader runs in its own task shared by every coroutine
+        missing the key, so cancelling one of them doesn't cancel it.
+        A load left by another (closed) event loop is started again.
+        """
+        item, refresh = self._lookup(key, ttl, refresh_ahead,
+                                     self.async_flights)
+        if item is not MISSING and not refresh:
+            return item
+        loop = asyncio.get_running_loop()
+        future = self.async_flights.get(key)
+        if future is None or future.get_loop() is not loop:
+            future = loop.create_future()
+            future.add_done_callback(
+                lambda done: done.cancelled() or done.exception())
+            self.async_flights[key] = future
+            future.task = loop.create_task(self._load_async(
+                key, loader, ttl, negative_ttl, future))
+            future.task.add_done_callback(
+                lambda task: self._abandon(key, future))
+        if item is not MISSING:
+            return item
+        return await asyncio.shield(future)
+
+    def _lookup(self, key, ttl, refresh_ahead, flights):
+        """ Item of key for get_or_load (MISSING on a miss, None for a
+        remembered negative result) and whether to refresh it
+        """
+        if self.negatives:
+            deadline = self.negatives.get(key)
+            if deadline is not None:
+                if deadline > self.clock():
+                    return None, False
+                del self.negatives[key]
+        item = self.get(key)
+        if item is None:
+            return MISSING, False
+        if refresh_ahead is None or ttl is None or key in flights or \
+                key not in self.expires:
+            return item, False
+        left = self.expires[key] - self.clock()
+        return item, left < (1 - refresh_ahead) * ttl
+
+    def _store(self, key, item, ttl, negative_ttl):
+        """ Put a loaded item, or remember a None result
+        """
+        if item is not None:
+            self.negatives.pop(key, None)
+            self.put(key, item, ttl)
+        elif negative_ttl is not None:
+            self.negatives[key] = self.clock() + negative_ttl
+            if self.max_items is not None and \
+                    len(self.negatives) > self.max_items:
+                del self.negatives[next(iter(self.negatives))]
+
+    def _load(self, key, loader, ttl, negative_ttl, flight):
+        """ Run loader for the flight of key in the current thread
+        The flight is dropped and finished whatever happens, even when
+        loader raises KeyboardInterrupt or SystemExit, which are then
+        raised again.
+        """
+        start = time.perf_counter()
+        item = error = None
+        try:
+            item = loader(key)
+            with self.lock:
+                self.stats.record_load(time.perf_counter() - start)
+                self._store(key, item, ttl, negative_ttl)
+        except Exception as exc:
+            error = exc
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.finish(item, error)
+
+    async def _load_async(self, key, loader, ttl, negative_ttl, future):
+        """ Await loader for the future of key
+        """
+        start = time.perf_counter()
+        try:
+            item = await loader(key)
+        except Exception as error:
+            del self.async_flights[key]
+            future.set_exception(error)
+            return
+        self.stats.record_load(time.perf_counter() - start)
+        self._store(key, item, ttl, negative_ttl)
+        del self.async_flights[key]
+        future.set_result(item)
+
+    def _abandon(self, key, future):
+        """ Drop the future of key and cancel it if its load task ended
+        without settling it (cancelled, even before it started)
+        """
+        if future.done():
+            return
+        if self.async_flights.get(key) is future:
+            del self.async_flights[key]
+        future.cancel()
+
+    def dump(self, path):
+        """ Save the cache to path
+        The file is a stream of pickles: a header, batches of
+        DUMP_BATCH (key, item, remaining ttl) in cache_data order (the
+        last batch is shorter), then the policy state.
+        """
+        now = self.clock()
+        with open(path, "wb") as f:
+            pickler = pickle.Pickler(f, pickle.HIGHEST_PROTOCOL)
+            pickler.dump((DUMP_FORMAT, type(self).__name__,
+                          len(self.cache_data)))
+            batch = []
+            for key, item in self.cache_data.items():
+                if self.arena is not None:
+                    item = self.arena.read(item)
+                deadline = self.expires.get(key)
+                batch.append((key, item,
+                              None if deadline is None else deadline - now))
+                if len(batch) == DUMP_BATCH:
+                    pickler.dump(batch)
+                    pickler.clear_memo()
+                    batch = []
+            pickler.dump(batch)
+            pickler.dump(self._dump_state())
+
+    def load(self, path):
+        """ Replace the content of the cache with a file saved by dump
+        Raise ValueError if the file was dumped by another policy or
+        holds more items than max_items. Items are then discarded, as
+        put would, until the rest fits in max_bytes.
+        """
+        with open(path, "rb") as f:
+            unpickler = pickle.Unpickler(f)
+            header = unpickler.load()
+            if header[:2] != (DUMP_FORMAT, type(self).__name__):
+                raise ValueError("{} is not a {} dump".format(
+                    path, type(self).__name__))
+            if self.max_items is not None and header[2] > self.max_items:
+                raise ValueError("{} holds {} items, more than {}".format(
+                    path, header[2], self.max_items))
+            self.clear()
+            while True:
+                batch = unpickler.load()
+                for key, item, ttl in batch:
+                    size = 0 if self.sizes is None else self.sizeof(item)
+                    if self.arena is not None:
+                        item = self.arena.store(item)
+                    self.cache_data[key] = item
+                    if self.sizes is not None:
+                        self.sizes[key] = size
+                        self.total_bytes += size
+                    if self.trie is not None:
+                        self.trie.add(key)
+                    if ttl is not None:
+                        self._set_ttl(key, ttl)
+                if len(batch) < DUMP_BATCH:
+                    break
+            self._load_state(unpickler.load())
+        if self.expires:
+            self.expire()
+        self._make_room(0, 0)
+
+    def _dump_state(self):
+        """ Policy state to save besides the order of cache_data
+        """
+        return None
+
+    def _load_state(self, state):
+        """ Rebuild the policy state after load filled cache_data
+        By default every key is inserted again, in order.
+        """
+        for key in self.cache_data:
+            self._on_insert(key)
+
+    def _make_room(self, items, size):
+        """ Discard items until `items` more items weighing `size` bytes
+        fit in both the item and the byte budget
+        """
+        if self.max_items is not None:
+            while len(self.cache_data) + items > self.max_items:
+                self.discard(self._victim())
+        if self.max_bytes is not None:
+            while self.cache_data and \
+                    self.total_bytes + size > self.max_bytes:
+                self.discard(self._victim())
+
+    def invalidate_prefix(self, prefix):
+        """ Remove every item whose key starts with prefix, without
+        reporting them to the listeners (needs a key separator)
+        Return the number of removed items.
+        """
+        if self.trie is None:
+            raise ValueError("invalidate_prefix needs a key separator")
+        keys = self.trie.keys_with_prefix(prefix)
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self):
+        """ Remove every item, without reporting them to the listeners
+        """
+        for key in list(self.cache_data):
+            self._remove(key)
+
+    def discard(self, key):
+        """ Remove key from the cache and report it to the listeners
+        """
+        item = self.cache_data[key]
+        if self.arena is not None and self.listeners:
+            item = self.arena.read(item)
+        self._remove(key)
+        self.stats.evictions += 1
+        for listener in self.listeners:
+            listener(key, item)
+
+    def _remove(self, key):
+        """ Remove key from the cache and every bookkeeping structure
+        """
+        item = self.cache_data.pop(key)
+        if self.arena is not None:
+            self.arena.free(item)
+        if self.sizes is not None:
+            self.total_bytes -= self.sizes.pop(key)
+        if self.expires and self.expires.pop(key, None) is not None:
+            self.wheel.cancel(key)
+        if self.trie is not None:
+            self.trie.remove(key)
+        self._on_discard(key)
+
+    def _victim(self):
+        """ Key to discard when the cache is full
+        """
+        raise NotImplementedError("_victim must be implemented in your "
+                                  "cache class")
+
+    def _on_insert(self, key):
+        """ Hook called after a new key was stored
+        """
+
+    def _on_update(self, key):
+        """ Hook called after an existing key got a new item
+        """
+
+    def _on_access(self, key):
+        """ Hook called after a successful get
+        """
+
+    def _on_discard(self, key):
+        """ Hook called after key was removed from cache_data
         """
-        raise NotImplementedError("get must be implemented in your cache class")
\ No newline at end of file
@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+""" CacheStats module
+"""
+
+
+class CacheStats():
+    """ CacheStats defines the counters of a caching system:
+      - hits, misses, evictions and expirations
+      - promotions of items from a slower tier
+      - loads and the total time spent loading missing items
+      - an optional latency histogram of sampled operations
+
+    Counters are plain integers, so updating them costs one attribute
+    increment. The histogram has one bucket per power of two of
+    nanoseconds and is only fed one operation out of `sample_every`.
+    """
+    def __init__(self, sample_every=0):
+        """ Initiliaze
+        Args:
+            sample_every: time one get out of sample_every
+                (no timing if 0).
+        """
+        self.sample_every = sample_every
+        self.reset()
+
+    def reset(self):
+        """ Set every counter back to 0
+        """
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.promotions = 0
+        self.loads = 0
+        self.load_time = 0.0
+        self.histogram = [0] * 64
+
+    @property
+    def hit_ratio(self):
+        """ Ratio of gets that found their item
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def load_penalty(self):
+        """ Average time spent loading a missing item, in seconds
+        """
+        return self.load_time / self.loads if self.loads else 0.0
+
+    def record_load(self, seconds):
+        """ Count one load that took seconds
+        """
+        self.loads += 1
+        self.load_time += seconds
+
+    def record_latency(self, nanoseconds):
+        """ Count one sampled operation in the latency histogram
+        """
+        self.histogram[min(int(nanoseconds).bit_length(), 63)] += 1
+
+    def percentile(self, percent):
+        """ Upper bound, in nanoseconds, of the given percentile
+        of the sampled latencies (0 if nothing was sampled)
+        """
+        total = sum(self.histogram)
+        if not total:
+            return 0
+        rank = total * percent / 100
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= rank:
+                return (1 << bucket) - 1
+        return (1 << 63) - 1
+
+    def as_dict(self):
+        """ Counters as a dictionary
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hit_ratio,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "promotions": self.promotions,
+            "loads": self.loads,
+            "load_penalty": self.load_penalty,
+        }
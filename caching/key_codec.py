@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+""" key_codec module
+"""
+import struct
+
+LENGTH = struct.Struct("<I")
+
+
+def encode_key(key):
+    """ Canonical bytes of key, the same in every process
+    Keys that compare equal get the same bytes: 1, 1.0 and True are
+    all encoded as the integer 1. Supported keys are str, bytes, int,
+    bool, float and tuples of them; TypeError is raised for any other.
+    """
+    if isinstance(key, str):
+        return b"s" + key.encode("utf-8", "surrogatepass")
+    if isinstance(key, bytes):
+        return b"b" + key
+    if isinstance(key, float):
+        if not key.is_integer():
+            return b"f" + key.hex().encode()
+        key = int(key)
+    if isinstance(key, int):
+        return b"i" + str(int(key)).encode()
+    if isinstance(key, tuple):
+        parts = [b"t"]
+        for element in key:
+            data = encode_key(element)
+            parts.append(LENGTH.pack(len(data)))
+            parts.append(data)
+        return b"".join(parts)
+    raise TypeError("unsupported key type: {}".format(type(key).__name__))
+
+
+def decode_key(data):
+    """ Key of the bytes made by encode_key
+    An integral float comes back as an int, which compares equal.
+    """
+    kind, body = data[:1], bytes(data[1:])
+    if kind == b"s":
+        return body.decode("utf-8", "surrogatepass")
+    if kind == b"b":
+        return body
+    if kind == b"f":
+        return float.fromhex(body.decode())
+    if kind == b"i":
+        return int(body)
+    if kind == b"t":
+        elements, start = [], 0
+        while start < len(body):
+            size, = LENGTH.unpack_from(body, start)
+            start += LENGTH.size
+            elements.append(decode_key(body[start:start + size]))
+            start += size
+        return tuple(elements)
+    raise ValueError("invalid key encoding")
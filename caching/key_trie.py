@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+""" KeyTrie module
+"""
+
+
+class KeyTrie():
+    """ KeyTrie indexes keys like "user:42:profile" by segment:
+      - every node is a dict of segment to child node
+      - the node of a complete key holds it under the None entry, in
+        the set of the keys with that text (1 and "1" share a node)
+      - empty nodes are pruned when keys are removed
+
+    Finding the keys under a prefix costs the size of the matching
+    subtrees (plus the siblings checked for a partial last segment),
+    never a scan of every key.
+    """
+    def __init__(self, separator=":"):
+        """ Initiliaze
+        Args:
+            separator: separator of the key segments.
+        """
+        self.separator = separator
+        self.root = {}
+
+    def add(self, key):
+        """ Index key
+        """
+        node = self.root
+        for part in str(key).split(self.separator):
+            node = node.setdefault(part, {})
+        node.setdefault(None, set()).add(key)
+
+    def remove(self, key):
+        """ Unindex key if it is indexed
+        """
+        path, node = [], self.root
+        for part in str(key).split(self.separator):
+            child = node.get(part)
+            if child is None:
+                return
+            path.append((node, part))
+            node = child
+        keys = node.get(None)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del node[None]
+        while path and not node:
+            node, part = path.pop()
+            del node[part]
+
+    def keys_with_prefix(self, prefix):
+        """ List of the indexed keys whose text starts with prefix
+        """
+        parts = prefix.split(self.separator)
+        last = parts.pop()
+        node = self.root
+        for part in parts:
+            node = node.get(part)
+            if node is None:
+                return []
+        keys = []
+        stack = [child for part, child in node.items()
+                 if part is not None and part.startswith(last)]
+        while stack:
+            node = stack.pop()
+            for part, child in node.items():
+                if part is None:
+                    keys.extend(child)
+                else:
+                    stack.append(child)
+        return keys
@@ -0,0 +1,33 @@
+#!/usr/bin/python3
+""" Flight module
+"""
+import threading
+
+
+class Flight():
+    """ Flight defines one call in progress:
+      - the first caller runs it and publishes its result or error
+      - every other caller waits for that result instead of running
+        the same call again
+    """
+    def __init__(self):
+        """ Initiliaze
+        """
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def finish(self, result=None, error=None):
+        """ Publish the result (or the error) and wake up the waiters
+        """
+        self.result = result
+        self.error = error
+        self.done.set()
+
+    def wait(self):
+        """ Wait for the call, return its result or raise its error
+        """
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
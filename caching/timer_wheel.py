@@ -0,0 +1,115 @@
+#!/usr/bin/python3
+""" TimerWheel module
+"""
+import math
+
+
+class TimerWheel():
+    """ TimerWheel defines a hierarchical timing wheel:
+      - LEVELS wheels of SLOTS slots, level n slots span SLOTS ** n ticks
+      - a key is stored in the lowest level able to hold its deadline,
+        and moved down (cascaded) when its level reaches its slot
+
+    Scheduling and cancelling are O(1) and advancing the wheel costs
+    O(1) per due key, so expired keys are reclaimed without scanning
+    everything that is scheduled. Ticks with nothing to do in the lower
+    levels are skipped, so a long idle period is cheap too.
+    """
+    SLOTS = 64
+    LEVELS = 4
+
+    def __init__(self, now=0.0, resolution=1.0):
+        """ Initiliaze
+        Args:
+            now: current time, in seconds.
+            resolution: duration of a tick, in seconds.
+        """
+        self.resolution = resolution
+        self.current = int(now / resolution)
+        self.wheels = [[{} for _ in range(self.SLOTS)]
+                       for _ in range(self.LEVELS)]
+        self.counts = [0] * self.LEVELS
+        self.where = {}
+
+    def __len__(self):
+        """ Number of scheduled keys
+        """
+        return len(self.where)
+
+    def schedule(self, key, deadline):
+        """ Schedule key to be due at deadline (in seconds),
+        replacing any previous deadline of key
+        """
+        self.cancel(key)
+        tick = max(math.ceil(deadline / self.resolution), self.current + 1)
+        self._place(key, tick)
+
+    def cancel(self, key):
+        """ Unschedule key if it is scheduled
+        """
+        where = self.where.pop(key, None)
+        if where is not None:
+            level, slot = where
+            del self.wheels[level][slot][key]
+            self.counts[level] -= 1
+
+    def _place(self, key, tick):
+        """ Store key in the slot of the lowest level holding tick
+        """
+        delta = tick - self.current
+        level, span = 0, 1
+        while level < self.LEVELS - 1 and delta >= span * self.SLOTS:
+            level += 1
+            span *= self.SLOTS
+        if delta >= span * self.SLOTS:
+            slot = (self.current // span + self.SLOTS - 1) % self.SLOTS
+        else:
+            slot = (tick // span) % self.SLOTS
+        self.wheels[level][slot][key] = tick
+        self.where[key] = (level, slot)
+        self.counts[level] += 1
+
+    def advance(self, now):
+        """ Move the wheel to now (in seconds)
+        Return the list of keys that became due, they are unscheduled.
+        """
+        target = int(now / self.resolution)
+        due = []
+        while self.current < target:
+            if not self.where:
+                self.current = target
+                break
+            step, span = 1, 1
+            for level in range(self.LEVELS - 1):
+                if self.counts[level]:
+                    break
+                span *= self.SLOTS
+                step = span - self.current % span
+            self.current = min(self.current + step, target)
+            self._cascade()
+            slot = self.wheels[0][self.current % self.SLOTS]
+            if slot:
+                for key in slot:
+                    del self.where[key]
+                self.counts[0] -= len(slot)
+                due.extend(slot)
+                slot.clear()
+        return due
+
+    def _cascade(self):
+        """ Move down the keys of every level whose slot starts now
+        """
+        span = 1
+        for level in range(1, self.LEVELS):
+            span *= self.SLOTS
+            if self.current % span:
+                return
+            index = (self.current // span) % self.SLOTS
+            slot = self.wheels[level][index]
+            if not slot:
+                continue
+            self.wheels[level][index] = {}
+            self.counts[level] -= len(slot)
+            for key, tick in slot.items():
+                del self.where[key]
+                self._place(key, max(tick, self.current))
@@ -0,0 +1,146 @@
+#!/usr/bin/python3
+""" SlabArena module
+"""
+import mmap
+import threading
+from array import array
+
+
+class Slab():
+    """ Slab defines one buffer cut into chunks of the same size
+    """
+    def __init__(self, chunk_size, chunks, huge, use_mmap):
+        """ Initiliaze
+        Args:
+            chunk_size: size of every chunk, in bytes.
+            chunks: number of chunks.
+            huge: whether the slab holds a single oversized value.
+            use_mmap: allocate the buffer with an anonymous mmap
+                instead of a bytearray.
+        """
+        size = chunk_size * chunks
+        self.buffer = mmap.mmap(-1, size) if use_mmap else bytearray(size)
+        self.view = memoryview(self.buffer)
+        self.chunk_size = chunk_size
+        self.huge = huge
+        self.free = array('l', range(chunks - 1, -1, -1))
+        self.used = 0
+
+
+class SlabArena():
+    """ SlabArena stores serialized values outside of Python objects:
+      - values are copied into fixed-size chunks of large slabs, one
+        size class per power of two from MIN_CHUNK to slab_size bytes
+      - a value is identified by an integer handle packing its slab,
+        chunk and length, so the cache holds no object per value that
+        the garbage collector has to track
+      - `view` returns a zero-copy memoryview of a value, valid until
+        its handle is freed
+      - a slab whose chunks are all free is released, except the last
+        one of its size class; values bigger than slab_size get a
+        slab of their own
+    """
+    MIN_CHUNK = 64
+    MAX_CHUNKS = 1 << 20
+    MAX_LENGTH = 1 << 32
+
+    def __init__(self, slab_size=1 << 20, use_mmap=True):
+        """ Initiliaze
+        Args:
+            slab_size: size of a slab, in bytes.
+            use_mmap: allocate slabs with anonymous mmaps (off the
+                Python heap) instead of bytearrays.
+        A handle keeps 20 bits for the chunk and 32 for the length, so
+        ValueError is raised if a slab holds more than MAX_CHUNKS chunks
+        of MIN_CHUNK bytes.
+        """
+        if slab_size // self.MIN_CHUNK > self.MAX_CHUNKS:
+            raise ValueError("slab_size must be at most {} bytes".format(
+                self.MAX_CHUNKS * self.MIN_CHUNK))
+        self.slab_size = slab_size
+        self.use_mmap = use_mmap
+        self.slabs = {}
+        self.available = {}
+        self.next_id = 0
+        self.used_bytes = 0
+        self.allocated_bytes = 0
+        self.lock = threading.Lock()
+
+    def store(self, data):
+        """ Copy data (any bytes-like object) into a free chunk
+        Return the handle of the stored value, ValueError if data
+        holds MAX_LENGTH bytes or more.
+        """
+        if not isinstance(data, (bytes, bytearray)):
+            data = memoryview(data).cast('B')
+        length = len(data)
+        if length >= self.MAX_LENGTH:
+            raise ValueError("values must be smaller than {} bytes".format(
+                self.MAX_LENGTH))
+        with self.lock:
+            chunk_size = 1 << (length - 1).bit_length()
+            if chunk_size < self.MIN_CHUNK:
+                chunk_size = self.MIN_CHUNK
+            huge = chunk_size > self.slab_size
+            if huge:
+                slab_id, slab = self._new_slab(length, 1, True)
+            else:
+                slabs = self.available.setdefault(chunk_size, {})
+                if slabs:
+                    slab_id = next(iter(slabs))
+                    slab = slabs[slab_id]
+                else:
+                    slab_id, slab = self._new_slab(
+                        chunk_size, self.slab_size // chunk_size, False)
+                    slabs[slab_id] = slab
+            chunk = slab.free.pop()
+            slab.used += 1
+            if not slab.free and not huge:
+                self.available[chunk_size].pop(slab_id)
+            self.used_bytes += length
+        start = chunk * slab.chunk_size
+        slab.view[start:start + length] = data
+        return (slab_id << 52) | (chunk << 32) | length
+
+    def _new_slab(self, chunk_size, chunks, huge):
+        """ Allocate a new slab
+        """
+        slab = Slab(chunk_size, chunks, huge, self.use_mmap)
+        slab_id = self.next_id
+        self.next_id += 1
+        self.slabs[slab_id] = slab
+        self.allocated_bytes += chunk_size * chunks
+        return slab_id, slab
+
+    def view(self, handle):
+        """ Zero-copy memoryview of the value of handle
+        """
+        slab = self.slabs[handle >> 52]
+        start = ((handle >> 32) & 0xFFFFF) * slab.chunk_size
+        return slab.view[start:start + (handle & 0xFFFFFFFF)]
+
+    def read(self, handle):
+        """ Copy of the value of handle (bytes, or bytearray for
+        bytearray slabs)
+        """
+        slab = self.slabs[handle >> 52]
+        start = ((handle >> 32) & 0xFFFFF) * slab.chunk_size
+        return slab.buffer[start:start + (handle & 0xFFFFFFFF)]
+
+    def free(self, handle):
+        """ Give the chunk of handle back to its slab
+        """
+        with self.lock:
+            slab_id = handle >> 52
+            slab = self.slabs[slab_id]
+            slab.free.append((handle >> 32) & 0xFFFFF)
+            slab.used -= 1
+            self.used_bytes -= handle & 0xFFFFFFFF
+            if not slab.huge:
+                slabs = self.available.setdefault(slab.chunk_size, {})
+                if slab.used or len(slabs) == (slab_id in slabs):
+                    slabs[slab_id] = slab
+                    return
+                slabs.pop(slab_id, None)
+            del self.slabs[slab_id]
+            self.allocated_bytes -= len(slab.buffer)
@@ -1,8 +1,15 @@
 #!/usr/bin/env python3
 """Implement a method named get_page that takes two integer argument"""
 
-from typing import Tuple, List
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 import csv
+import threading
+from columnar import ColumnarDataset
+from cursor import decode_cursor, encode_cursor
+from ingest import ingest
+from query_index import QueryIndex, Selection
+from row_index import RowIndex
+import snapshot
 
 
 def index_range(page: int, page_size: int) -> Tuple[int, int]:
@@ -16,24 +23,182 @@ class Server:
     """Server class to paginate a database of popular baby names.
     """
     DATA_FILE = "Popular_Baby_Names.csv"
+    FILTERS = {"year": 0, "gender": 1, "ethnicity": 2}
+    SORTS = {"Name": 3, "Count": 4, "Rank": 5}
 
-    def __init__(self):
+    def __init__(self, columnar: bool = False,
+                 workers: Optional[int] = None):
+        """columnar keeps the dataset as a ColumnarDataset, and workers
+        processes parse the CSV in parallel if given (ingest_rate then
+        holds their rows per second)
+        """
+        self.columnar = columnar
+        self.workers = workers
+        self.ingest_rate = None
         self.__dataset = None
+        self.__index = None
+        self.__columns = None
+        self.__orders = None
+        self.__query_index = None
+        self.__lock = threading.RLock()
 
-    def dataset(self) -> List[List]:
-        """Cached dataset
+    def dataset(self) -> Sequence[List]:
+        """Cached dataset, a ColumnarDataset in columnar mode, a list of
+        rows sharing their equal fields otherwise. It is loaded from
+        its snapshot beside DATA_FILE while that matches the file, and
+        concurrent first calls load it once.
         """
         if self.__dataset is None:
+            with self.__lock:
+                if self.__dataset is None:
+                    if self.columnar:
+                        self.__dataset = self.columns()
+                    else:
+                        self.__dataset = self.list_rows()
+
+        return self.__dataset
+
+    def list_rows(self) -> List[List]:
+        """Rows of DATA_FILE from the "rows" snapshot, parsed (and saved
+        to it) if it doesn't match the file. Equal fields are one str,
+        so the snapshot loads without creating a str per field.
+        """
+        state = snapshot.load(self.DATA_FILE, "rows")
+        if state is None:
+            if self.workers is None:
+                with open(self.DATA_FILE) as f:
+                    reader = csv.reader(f)
+                    next(reader, None)
+                    rows = list(reader)
+            else:
+                rows = self.parse()[:]
+            fields = {}
+            state = {"rows": [[fields.setdefault(field, field)
+                               for field in row] for row in rows]}
+            snapshot.save(self.DATA_FILE, "rows", state)
+        return state["rows"]
+
+    def index(self) -> RowIndex:
+        """Rows read from disk on demand through a byte-offset index
+        """
+        if self.__index is None:
+            with self.__lock:
+                if self.__index is None:
+                    self.__index = RowIndex(self.DATA_FILE)
+        return self.__index
+
+    def columns(self) -> ColumnarDataset:
+        """Cached dataset in columnar form, for filtered or sorted rows,
+        loaded from the "columns" snapshot beside DATA_FILE while it
+        matches the file, parsed (and saved to it) otherwise
+        """
+        if self.__columns is None:
+            with self.__lock:
+                if self.__columns is None:
+                    state = snapshot.load(self.DATA_FILE, "columns")
+                    if state is None:
+                        state = {"columns": self.parse()}
+                        snapshot.save(self.DATA_FILE, "columns", state)
+                    self.__orders = state.get("orders", {})
+                    self.__columns = state["columns"]
+        return self.__columns
+
+    def parse(self) -> ColumnarDataset:
+        """Parse DATA_FILE, in parallel with workers processes
+        """
+        if self.workers is None:
             with open(self.DATA_FILE) as f:
                 reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]
+                next(reader, None)
+                return ColumnarDataset(reader)
+        ingested = ingest(self.DATA_FILE, self.workers)
+        self.ingest_rate = ingested.rows_per_second
+        if self.__index is None:
+            self.__index = RowIndex(self.DATA_FILE, ingested.offsets)
+        return ingested.dataset
 
-        return self.__dataset
+    def query_index(self) -> QueryIndex:
+        """Secondary indexes of the columnar dataset, starting with the
+        permutations of the snapshot
+        """
+        if self.__query_index is None:
+            with self.__lock:
+                if self.__query_index is None:
+                    query_index = QueryIndex(self.columns())
+                    query_index.orders.update(self.__orders)
+                    self.__query_index = query_index
+        return self.__query_index
+
+    def save_snapshot(self) -> None:
+        """Save the dataset and the permutations built so far to the
+        snapshot, so that later Servers start with them
+        """
+        with self.__lock:
+            snapshot.save(self.DATA_FILE, "columns", {
+                "columns": self.columns(),
+                "orders": dict(self.query_index().orders)
+            })
 
-    def get_page(self, page: int = 1, page_size: int = 10) -> List[List]:
-        """Implement a method named get_page that takes two integer"""
+    def rows(self, year: Optional[int] = None, gender: Optional[str] = None,
+             ethnicity: Optional[str] = None, sort: Optional[str] = None,
+             after: Optional[Tuple[Optional[str], int]] = None
+             ) -> Sequence[List]:
+        """Rows of the given year, gender and ethnicity (any if None)
+        sorted on sort, one of SORTS prefixed by "-" for descending
+        order (file order if None), following after (the sort field
+        and position of a row) if given
+        """
+        filters = {self.FILTERS[name]: value for name, value in
+                   (("year", year), ("gender", gender),
+                    ("ethnicity", ethnicity)) if value is not None}
+        if not filters and sort is None:
+            if after is None:
+                return self.index()
+            return Selection(self.index(),
+                             range(max(after[1] + 1, 0), len(self.index())))
+        column = None
+        if sort is not None:
+            assert isinstance(sort, str) and sort.lstrip("-") in self.SORTS
+            column = self.SORTS[sort.lstrip("-")]
+        return self.query_index().select(filters, column,
+                                         sort is not None and
+                                         sort.startswith("-"), after)
+
+    def get_page(self, page: int = 1, page_size: int = 10,
+                 **query: Any) -> List[List]:
+        """Implement a method named get_page that takes two integer
+        query: year, gender, ethnicity and sort of rows()"""
         assert isinstance(page, int) and page > 0
         assert isinstance(page_size, int) and page_size > 0
         start, end = index_range(page, page_size)
-        return self.dataset()[start:end]
+        return self.rows(**query)[start:end]
+
+    def get_page_after(self, cursor: Optional[str] = None,
+                       page_size: int = 10, **query: Any) -> Dict:
+        """Page of the page_size rows following cursor (the first ones
+        of query if None) and the cursor of the next page (None after
+        the last row). A cursor holds the query and the sort key of the
+        last row of its page, so the next page starts after that row
+        even if rows were inserted before it, and costs the same at
+        any depth.
+        """
+        assert isinstance(page_size, int) and page_size > 0
+        after = None
+        if cursor is not None:
+            query, *after = decode_cursor(cursor, self.FILTERS, self.SORTS)
+        rows = self.rows(after=after, **query)
+        data = rows[:page_size]
+        next_cursor = None
+        if len(rows) > page_size:
+            positions = getattr(rows, "positions", range(len(rows)))
+            sort = query.get("sort")
+            field = None
+            if sort is not None:
+                field = data[-1][self.SORTS[sort.lstrip("-")]]
+            next_cursor = encode_cursor(query, field,
+                                        positions[page_size - 1])
+        return {
+            "page_size": len(data),
+            "data": data,
+            "next_cursor": next_cursor
+        }
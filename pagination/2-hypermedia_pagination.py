@@ -2,48 +2,24 @@
 """Implement a get_hyper method that takes the same arguments"""
 
 
-from typing import Tuple, List
-import csv
+from typing import Any
 
+simple_pagination = __import__('1-simple_pagination')
+index_range = simple_pagination.index_range
 
-def index_range(page: int, page_size: int) -> Tuple[int, int]:
-    """function named index_range that takes two integer arguments"""
-    start = (page - 1) * page_size
-    end = page * page_size
-    return (start, end)
 
-
-class Server:
-    """Server class to paginate a database of popular baby names.
+class Server(simple_pagination.Server):
+    """Server class to paginate a database of popular baby names,
+    with hypermedia pages.
     """
-    DATA_FILE = "Popular_Baby_Names.csv"
-
-    def __init__(self):
-        self.__dataset = None
-
-    def dataset(self) -> List[List]:
-        """Cached dataset
-        """
-        if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]
-
-        return self.__dataset
-
-    def get_page(self, page: int = 1, page_size: int = 10) -> List[List]:
-        """Implement a method named get_page that takes two integer"""
-        assert isinstance(page, int) and page > 0
-        assert isinstance(page_size, int) and page_size > 0
-        start, end = index_range(page, page_size)
-        return self.dataset()[start:end]
 
-    def get_hyper(self, page: int = 1, page_size: int = 10) -> dict:
+    def get_hyper(self, page: int = 1, page_size: int = 10,
+                  **query: Any) -> dict:
         """Implement a get_hyper method that takes the same arguments"""
-        data = self.get_page(page, page_size)
-        total_pages = len(self.dataset()) / page_size
-        if len(self.dataset()) % page_size != 0:
+        data = self.get_page(page, page_size, **query)
+        total = len(self.rows(**query))
+        total_pages = total / page_size
+        if total % page_size != 0:
             total_pages += 1
         return {
             "page_size": len(data),
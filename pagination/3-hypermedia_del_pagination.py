@@ -3,40 +3,27 @@
 Deletion-resilient hypermedia pagination
 """
 
-import csv
-import math
-from typing import List, Dict
+from typing import Dict
+from rank_index import IndexedDataset
 
+simple_pagination = __import__('1-simple_pagination')
 
-class Server:
+
+class Server(simple_pagination.Server):
     """Server class to paginate a database of popular baby names.
     """
-    DATA_FILE = "Popular_Baby_Names.csv"
-
-    def __init__(self):
-        self.__dataset = None
-        self.__indexed_dataset = None
 
-    def dataset(self) -> List[List]:
-        """Cached dataset
+    def __init__(self, *args, **kwargs):
+        """Same arguments as simple_pagination.Server
         """
-        if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]
-
-        return self.__dataset
+        super().__init__(*args, **kwargs)
+        self.__indexed_dataset = None
 
-    def indexed_dataset(self) -> Dict[int, List]:
+    def indexed_dataset(self) -> IndexedDataset:
         """Dataset indexed by sorting position, starting at 0
         """
         if self.__indexed_dataset is None:
-            dataset = self.dataset()
-            truncated_dataset = dataset[:1000]
-            self.__indexed_dataset = {
-                i: dataset[i] for i in range(len(dataset))
-            }
+            self.__indexed_dataset = IndexedDataset(self.dataset())
         return self.__indexed_dataset
 
     def get_hyper_index(self, index: int = None, page_size: int = 10) -> Dict:
@@ -44,14 +31,10 @@ class Server:
         assert isinstance(index, int) and index >= 0
         assert isinstance(page_size, int) and page_size > 0
         indexed_dataset = self.indexed_dataset()
-        assert index < len(indexed_dataset)
-        data = []
-        next_index = index + page_size
-        for i in range(index, next_index):
-            if indexed_dataset.get(i):
-                data.append(indexed_dataset[i])
-            else:
-                next_index += 1
+        assert index < indexed_dataset.size
+        positions = indexed_dataset.page(index, page_size)
+        data = [indexed_dataset[i] for i in positions]
+        next_index = positions[-1] + 1 if positions else indexed_dataset.size
         return {
             "index": index,
             "next_index": next_index,
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""Columnar, dictionary-encoded storage of CSV rows"""
+
+import sys
+from array import array
+from typing import Iterable, Iterator, List, Union
+
+WIDER = {"B": "H", "H": "I", "I": "Q"}
+LIMITS = {"B": 1 << 8, "H": 1 << 16, "I": 1 << 32, "Q": 1 << 64}
+
+
+class Column:
+    """One column of fields, stored as an array of integers.
+
+    A column of canonical integers (no sign, no leading zero) holds
+    them directly, in an array('H') widened to 'I' when needed. Any
+    other column is dictionary-encoded: values is the list of its
+    distinct fields (interned) and data holds their codes, in the
+    narrowest array for the number of values. An integer column turns
+    into a dictionary-encoded one on its first other field.
+    """
+    __slots__ = ("data", "values", "codes")
+
+    def __init__(self) -> None:
+        """Empty column of integers
+        """
+        self.data = array("H")
+        self.values = None
+        self.codes = None
+
+    def __len__(self) -> int:
+        """Number of fields
+        """
+        return len(self.data)
+
+    def append(self, field: str) -> None:
+        """Add field at the end of the column
+        """
+        if self.values is None:
+            if field.isascii() and field.isdigit() and \
+                    (field[0] != "0" or field == "0"):
+                number = int(field)
+                if number >= LIMITS[self.data.typecode]:
+                    self._widen(number)
+                if self.values is None:
+                    self.data.append(number)
+                    return
+            else:
+                self._encode()
+        code = self._code(field)
+        self.data.append(code)
+
+    def set(self, index: int, field: str) -> None:
+        """Replace the field of row index
+        """
+        if self.values is None:
+            if field.isascii() and field.isdigit() and \
+                    (field[0] != "0" or field == "0"):
+                number = int(field)
+                if number >= LIMITS[self.data.typecode]:
+                    self._widen(number)
+                if self.values is None:
+                    self.data[index] = number
+                    return
+            else:
+                self._encode()
+        code = self._code(field)
+        self.data[index] = code
+
+    def extend(self, other: "Column") -> None:
+        """Add the fields of other at the end of the column
+        """
+        if self.values is None and other.values is None:
+            typecode = max(self.data.typecode, other.data.typecode,
+                           key=LIMITS.__getitem__)
+            if typecode != self.data.typecode:
+                self.data = array(typecode, self.data)
+            if typecode != other.data.typecode:
+                self.data.extend(array(typecode, other.data))
+            else:
+                self.data.extend(other.data)
+            return
+        if self.values is None:
+            self._encode()
+        if other.values is None:
+            for number in other.data:
+                code = self._code(str(number))
+                self.data.append(code)
+            return
+        codes = [self._code(value) for value in other.values]
+        self.data.extend(array(self.data.typecode,
+                               map(codes.__getitem__, other.data)))
+
+    def _code(self, field: str) -> int:
+        """Code of field, adding it to the values if it is new
+        """
+        code = self.codes.get(field)
+        if code is None:
+            code = self.codes[field] = len(self.values)
+            self.values.append(sys.intern(field))
+            if code >= LIMITS[self.data.typecode]:
+                self.data = array(WIDER[self.data.typecode], self.data)
+        return code
+
+    def _widen(self, number: int) -> None:
+        """Widen the array of integers to hold number
+        """
+        typecode = self.data.typecode
+        while number >= LIMITS[typecode] and typecode != "Q":
+            typecode = WIDER[typecode]
+        if number >= LIMITS[typecode]:
+            self._encode()
+        else:
+            self.data = array(typecode, self.data)
+
+    def _encode(self) -> None:
+        """Turn the integers into codes of their str
+        """
+        self.values = []
+        self.codes = {}
+        numbers, self.data = self.data, array("B")
+        for number in numbers:
+            self.append(str(number))
+
+    def get(self, start: int, end: int) -> List[str]:
+        """Fields of the rows start to end (excluded)
+        """
+        if self.values is None:
+            return list(map(str, self.data[start:end]))
+        values = self.values
+        return [values[code] for code in self.data[start:end]]
+
+
+class ColumnarDataset:
+    """Rows of str fields stored as one Column per field.
+
+    Rows are only rebuilt, as lists of str, when they are read, so a
+    dataset whose fields repeat costs a few bytes per field instead of
+    a str object each. It reads like the list of its rows.
+    """
+
+    def __init__(self, rows: Iterable[List[str]] = ()) -> None:
+        """Dataset of rows
+        """
+        self.columns = []
+        self.extend(rows)
+
+    def __len__(self) -> int:
+        """Number of rows
+        """
+        return len(self.columns[0]) if self.columns else 0
+
+    def __getitem__(self, index: Union[int, slice]) -> List:
+        """Row index, or the list of rows of a slice
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return self.rows(start, stop)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+        return self.rows(index, index + 1)[0]
+
+    def __setitem__(self, index: int, row: List[str]) -> None:
+        """Replace row index, encoding its fields again (indexes built
+        on the dataset are not updated)
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+        if len(row) != len(self.columns):
+            raise ValueError("row has {} fields, expected {}".format(
+                len(row), len(self.columns)))
+        for column, field in zip(self.columns, row):
+            column.set(index, field)
+
+    def __iter__(self) -> Iterator[List[str]]:
+        """Rows in order, rebuilt 4096 at a time
+        """
+        for start in range(0, len(self), 4096):
+            yield from self.rows(start, start + 4096)
+
+    def rows(self, start: int, end: int) -> List[List[str]]:
+        """Rebuild the rows start to end (excluded)
+        """
+        if start >= end:
+            return []
+        return list(map(list, zip(*(column.get(start, end)
+                                    for column in self.columns))))
+
+    def extend(self, rows: Iterable[List[str]]) -> None:
+        """Add rows, every row having as many fields as the first one
+        """
+        for row in rows:
+            if not self.columns:
+                self.columns = [Column() for _ in row]
+            if len(row) != len(self.columns):
+                raise ValueError("row {} has {} fields, expected {}".format(
+                    len(self), len(row), len(self.columns)))
+            for column, field in zip(self.columns, row):
+                column.append(field)
+
+    def merge(self, other: "ColumnarDataset") -> None:
+        """Add the rows of other, re-encoding its columns
+        """
+        if not other.columns:
+            return
+        if not self.columns:
+            self.columns = [Column() for _ in other.columns]
+        if len(other.columns) != len(self.columns):
+            raise ValueError("rows have {} fields, expected {}".format(
+                len(other.columns), len(self.columns)))
+        for column, fields in zip(self.columns, other.columns):
+            column.extend(fields)
+
+    def nbytes(self) -> int:
+        """Approximate memory used by the columns, in bytes
+        """
+        size = 0
+        for column in self.columns:
+            size += sys.getsizeof(column.data)
+            if column.values is not None:
+                size += sys.getsizeof(column.values) + \
+                    sys.getsizeof(column.codes) + \
+                    sum(sys.getsizeof(value) for value in column.values)
+        return size
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Opaque cursors of keyset pagination"""
+
+import base64
+import json
+from typing import Collection, Dict, Optional, Tuple
+
+
+def encode_cursor(query: Dict, field: Optional[str], position: int) -> str:
+    """Cursor resuming query after the row at position whose sort field
+    is field (None without sort)
+    """
+    data = json.dumps([query, field, position], separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, filters: Collection[str],
+                  sorts: Collection[str]) -> Tuple[Dict, Optional[str], int]:
+    """Query, sort field and position of cursor, ValueError if it
+    wasn't made by encode_cursor for a query of filters and a sort on
+    one of sorts (prefixed by "-" or not)
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        query, field, position = json.loads(data)
+    except (TypeError, ValueError) as error:
+        raise ValueError("invalid cursor") from error
+    if not isinstance(query, dict) or not isinstance(position, int) or \
+            not (field is None or isinstance(field, str)):
+        raise ValueError("invalid cursor")
+    sort = query.get("sort")
+    if not set(query) <= set(filters) | {"sort"} or \
+            (field is None) != (sort is None) or \
+            not (sort is None or isinstance(sort, str) and
+                 sort.lstrip("-") in sorts):
+        raise ValueError("invalid cursor")
+    return query, field, position
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Secondary indexes answering filtered and sorted queries"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from columnar import ColumnarDataset
+
+
+class Selection:
+    """Rows of a dataset at some positions, read like a list of rows
+    """
+
+    def __init__(self, dataset: Sequence[List],
+                 positions: Sequence[int]) -> None:
+        """Rows of dataset at positions
+        """
+        self.dataset = dataset
+        self.positions = positions
+
+    def __len__(self) -> int:
+        """Number of rows
+        """
+        return len(self.positions)
+
+    def __getitem__(self, index: Union[int, slice]) -> List:
+        """Row index, or the list of rows of a slice
+        """
+        if isinstance(index, slice):
+            return [self.dataset[i] for i in self.positions[index]]
+        return self.dataset[self.positions[index]]
+
+
+class QueryIndex:
+    """Sorted permutations of the rows of a ColumnarDataset.
+
+    A query keeps the rows whose fields equal some values and sorts
+    them on one column. Its shape (the filtered columns, the sort
+    column and direction) has its own permutation, built on first use,
+    ordering the rows by the filtered fields, then the sort field, then
+    position. The rows of any query are therefore a contiguous range of
+    the permutation of its shape, found by two binary searches, and a
+    page costs O(log n + page_size) however deep it is.
+    """
+
+    def __init__(self, dataset: ColumnarDataset) -> None:
+        """Index of dataset, building permutations on first use
+        """
+        self.dataset = dataset
+        self.keys = {}
+        self.ranks = {}
+        self.values = {}
+        self.orders = {}
+
+    def key(self, column: int, reverse: bool = False) -> Sequence[int]:
+        """Sort key of every row for column: the integer of a numeric
+        column, the rank of the value of an encoded one (negated if
+        reverse)
+        """
+        keys = self.keys.get((column, reverse))
+        if keys is None:
+            data = self.dataset.columns[column]
+            if reverse:
+                keys = [-key for key in self.key(column)]
+            elif data.values is None:
+                keys = data.data
+            else:
+                ranks = array("I", bytes(4 * len(data.values)))
+                by_value = sorted(range(len(data.values)),
+                                  key=data.values.__getitem__)
+                for rank, code in enumerate(by_value):
+                    ranks[code] = rank
+                self.ranks[column] = ranks
+                self.values[column] = [data.values[code]
+                                       for code in by_value]
+                keys = array("I", map(ranks.__getitem__, data.data))
+            self.keys[column, reverse] = keys
+        return keys
+
+    def value(self, column: int, field) -> Optional[int]:
+        """Key of field in column, None if no row can have it
+        """
+        field = str(field)
+        data = self.dataset.columns[column]
+        if data.values is None:
+            if field.isascii() and field.isdigit() and \
+                    str(int(field)) == field:
+                return int(field)
+            return None
+        code = data.codes.get(field)
+        if code is None:
+            return None
+        self.key(column)
+        return self.ranks[column][code]
+
+    def order(self, columns: Tuple[int, ...], sort: Optional[int],
+              reverse: bool = False) -> array:
+        """Permutation of the rows for a query shape
+        """
+        shape = (columns, sort, reverse)
+        order = self.orders.get(shape)
+        if order is None:
+            keys = [self.key(column) for column in columns]
+            if sort is not None:
+                keys.append(self.key(sort, reverse))
+            positions = range(len(self.dataset))
+            if len(keys) == 1:
+                order = array("I", sorted(positions,
+                                          key=keys[0].__getitem__))
+            elif keys:
+                rows = list(zip(*keys))
+                order = array("I", sorted(positions, key=rows.__getitem__))
+            else:
+                order = array("I", positions)
+            self.orders[shape] = order
+        return order
+
+    def bound(self, column: int, field: str, reverse: bool) -> Tuple:
+        """Sort key and position just after a row of column field, even
+        if no row has field any more
+        """
+        data = self.dataset.columns[column]
+        if data.values is None:
+            key, exact = int(field), True
+        else:
+            self.key(column)
+            values = self.values[column]
+            key = bisect_left(values, field)
+            exact = key < len(values) and values[key] == field
+        if reverse:
+            return -key, None if exact else len(self.dataset)
+        return key, None if exact else -1
+
+    def select(self, filters: Dict[int, object], sort: Optional[int] = None,
+               reverse: bool = False,
+               after: Optional[Tuple[Optional[str], int]] = None
+               ) -> Selection:
+        """Rows whose field of every filtered column equals its value,
+        in sort column order (descending if reverse, position on ties),
+        from the one following after, the sort field and position of a
+        row (it needn't be there any more)
+        """
+        columns = tuple(sorted(filters))
+        target = tuple(self.value(column, filters[column])
+                       for column in columns)
+        if None in target:
+            return Selection(self.dataset, ())
+        order = self.order(columns, sort, reverse)
+        positions = memoryview(order)
+        keys = [self.key(column) for column in columns]
+
+        def probe(i):
+            """Fields of the filtered columns of row i
+            """
+            return tuple(key[i] for key in keys)
+        start, end = 0, len(order)
+        if columns:
+            start = bisect_left(order, target, key=probe)
+            end = bisect_right(order, target, lo=start, key=probe)
+        if after is not None:
+            field, position = after
+            if sort is not None:
+                keys.append(self.key(sort, reverse))
+                key, moved = self.bound(sort, field, reverse)
+                target += (key,)
+                if moved is not None:
+                    position = moved
+            keys.append(range(len(order)))
+            start = bisect_right(order, target + (position,), start, end,
+                                 key=probe)
+        return Selection(self.dataset, positions[start:end])
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""Rank/select index of the live rows of a dataset"""
+
+from array import array
+from collections.abc import MutableMapping
+from typing import Iterator, List, Sequence
+
+
+class RankIndex:
+    """Fenwick tree over positions 0 to size - 1, each live or deleted.
+
+    tree[i] counts the live positions in (i - lowbit(i), i] (1-based),
+    so deleting, inserting, ranking a position and selecting the k-th
+    live one cost O(log n). alive holds one byte per position.
+
+    Live positions are also linked in order: next[p] is the live
+    position following live p (size if none) and prev[p] the one
+    before it (-1 if none), so walking from a live position costs O(1)
+    per step. Links of deleted positions are stale.
+    """
+
+    def __init__(self, size: int = 0) -> None:
+        """Index of size positions, all live
+        """
+        self.size = size
+        self.count = size
+        self.alive = bytearray(b"\x01") * size
+        self.tree = array("I", (i & -i for i in range(size + 1)))
+        self.next = array("q", range(1, size + 1))
+        self.prev = array("q", range(-1, size - 1))
+
+    def __len__(self) -> int:
+        """Number of live positions
+        """
+        return self.count
+
+    def __contains__(self, position: int) -> bool:
+        """Whether position is live
+        """
+        return 0 <= position < self.size and self.alive[position] == 1
+
+    def _add(self, position: int, delta: int) -> None:
+        """Add delta to the count of position
+        """
+        i = position + 1
+        tree = self.tree
+        while i <= self.size:
+            tree[i] += delta
+            i += i & -i
+        self.count += delta
+
+    def delete(self, position: int) -> None:
+        """Mark position deleted, KeyError if it isn't live
+        """
+        if position not in self:
+            raise KeyError(position)
+        self.alive[position] = 0
+        self._add(position, -1)
+        after, before = self.next[position], self.prev[position]
+        if before >= 0:
+            self.next[before] = after
+        if after < self.size:
+            self.prev[after] = before
+
+    def insert(self, position: int) -> None:
+        """Mark position live, position size adding a new one
+        """
+        if position == self.size:
+            i = position + 1
+            self.tree.append(1 + self.rank(position) -
+                             self.rank(i - (i & -i)))
+            self.alive.append(1)
+            self.next.append(position + 1)
+            self.prev.append(self.select(self.count - 1)
+                             if self.count else -1)
+            self.size += 1
+            self.count += 1
+        elif 0 <= position < self.size:
+            if not self.alive[position]:
+                rank = self.rank(position)
+                before = self.select(rank - 1) if rank else -1
+                after = self.select(rank) if rank < self.count else self.size
+                self.alive[position] = 1
+                self._add(position, 1)
+                self.next[position], self.prev[position] = after, before
+                if before >= 0:
+                    self.next[before] = position
+                if after < self.size:
+                    self.prev[after] = position
+        else:
+            raise IndexError("position out of range")
+
+    def rank(self, position: int) -> int:
+        """Number of live positions before position
+        """
+        i = min(position, self.size)
+        tree = self.tree
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def select(self, k: int) -> int:
+        """Position of the k-th live position (from 0)
+        """
+        if not 0 <= k < self.count:
+            raise IndexError("rank out of range")
+        tree = self.tree
+        position = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            i = position + step
+            if i <= self.size and tree[i] <= k:
+                position = i
+                k -= tree[i]
+            step >>= 1
+        return position
+
+
+class IndexedDataset(MutableMapping):
+    """Live rows of a dataset by position, deleted rows leaving holes.
+
+    Rows are read from the dataset itself (no copy) and a RankIndex
+    tracks which positions are live, so a page of live rows starting
+    at any position costs O(log n + page_size) however many rows were
+    deleted around it.
+    """
+
+    def __init__(self, dataset: Sequence[List]) -> None:
+        """Index of the rows of dataset, all live
+        """
+        self.dataset = dataset
+        self.index = RankIndex(len(dataset))
+
+    def __len__(self) -> int:
+        """Number of live rows
+        """
+        return len(self.index)
+
+    @property
+    def size(self) -> int:
+        """Number of positions, live or deleted
+        """
+        return self.index.size
+
+    def __getitem__(self, position: int) -> List:
+        """Row at position, KeyError if it isn't live
+        """
+        if position not in self.index:
+            raise KeyError(position)
+        return self.dataset[position]
+
+    def __delitem__(self, position: int) -> None:
+        """Delete the row at position, KeyError if it isn't live
+        """
+        self.index.delete(position)
+
+    def __setitem__(self, position: int, row: List) -> None:
+        """Insert row at position, position size appending it
+        """
+        if position == self.index.size:
+            self.dataset.extend([row])
+        elif position not in self.index or self.dataset[position] != row:
+            self.dataset[position] = row
+        self.index.insert(position)
+
+    def __iter__(self) -> Iterator[int]:
+        """Live positions in increasing order
+        """
+        alive = self.index.alive
+        position = alive.find(1)
+        while position != -1:
+            yield position
+            position = alive.find(1, position + 1)
+
+    def page(self, position: int, page_size: int) -> List[int]:
+        """Positions of the first page_size live rows from position
+        """
+        index = self.index
+        first = index.rank(position)
+        if first >= index.count:
+            return []
+        position = index.select(first)
+        positions = []
+        while len(positions) < page_size and position < index.size:
+            positions.append(position)
+            position = index.next[position]
+        return positions
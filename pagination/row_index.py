@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Byte-offset row index of a CSV file, read through an mmap"""
+
+import csv
+import io
+import mmap
+import os
+from array import array
+from typing import Iterable, List, Optional, Union
+
+
+def scan(lines: Iterable[bytes], position: int = 0) -> array:
+    """Offsets of the CSV records starting in lines, the first line
+    being at byte position
+    """
+    offsets = array("Q")
+    quoted = False
+    for line in lines:
+        if not quoted:
+            offsets.append(position)
+        position += len(line)
+        if line.count(b'"') % 2:
+            quoted = not quoted
+    return offsets
+
+
+class RowIndex:
+    """Rows of a CSV file (header excluded), parsed only when read.
+
+    offsets[i] is the byte offset of row i and offsets[-1] the size of
+    the file, so rows i to j are the bytes offsets[i]:offsets[j] of the
+    mmap. The offsets are saved as an array('Q') beside the file and
+    reused while that sidecar is newer than the file and ends at its
+    size. Quoted fields may span lines.
+    """
+    SUFFIX = ".idx"
+
+    def __init__(self, path: str, offsets: Optional[array] = None) -> None:
+        """offsets, if given, were scanned from path by someone else
+        """
+        self.path = path
+        self.offsets = offsets
+        if offsets is None:
+            self.offsets = self.load()
+        if self.offsets is None:
+            self.offsets = self.build()
+            self.save()
+        elif offsets is not None:
+            self.save()
+        with open(path, "rb") as f:
+            if self.offsets[-1]:
+                self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self.mmap = b""
+
+    def __len__(self) -> int:
+        """Number of rows
+        """
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: Union[int, slice]) -> List:
+        """Row index, or the list of rows of a slice
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return self.rows(start, stop)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+        return self.rows(index, index + 1)[0]
+
+    def rows(self, start: int, end: int) -> List[List[str]]:
+        """Parse the rows start to end (excluded)
+        """
+        if start >= end:
+            return []
+        data = self.mmap[self.offsets[start]:self.offsets[end]]
+        return list(csv.reader(io.StringIO(data.decode("utf-8"),
+                                           newline="")))
+
+    def build(self) -> array:
+        """Scan the file for the offset of every row
+        """
+        with open(self.path, "rb") as f:
+            offsets = scan(f)
+            del offsets[:1]
+            offsets.append(f.tell())
+        return offsets
+
+    def load(self) -> Optional[array]:
+        """Offsets of the sidecar, None if it is missing or stale
+        """
+        sidecar = self.path + self.SUFFIX
+        try:
+            stat = os.stat(sidecar)
+            source = os.stat(self.path)
+        except OSError:
+            return None
+        if stat.st_mtime_ns < source.st_mtime_ns or not stat.st_size or \
+                stat.st_size % 8:
+            return None
+        offsets = array("Q")
+        with open(sidecar, "rb") as f:
+            offsets.fromfile(f, stat.st_size // 8)
+        if offsets[-1] != source.st_size:
+            return None
+        return offsets
+
+    def save(self) -> None:
+        """Write the offsets to the sidecar, replacing it atomically
+        """
+        sidecar = self.path + self.SUFFIX
+        temporary = "{}.{}".format(sidecar, os.getpid())
+        try:
+            with open(temporary, "wb") as f:
+                self.offsets.tofile(f)
+            os.replace(temporary, sidecar)
+        except OSError:
+            pass
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Binary snapshot of a parsed CSV file, stored beside it"""
+
+import os
+import pickle
+from typing import Dict, Optional
+
+SUFFIX = ".snap"
+FORMAT = 1
+
+
+def path(source: str, kind: str) -> str:
+    """Snapshot of the kind of state of source
+    """
+    return "{}.{}{}".format(source, kind, SUFFIX)
+
+
+def load(source: str, kind: str) -> Optional[Dict]:
+    """State of kind saved for source, None if there is no snapshot or
+    it was taken from a file of another size or modification time
+    """
+    try:
+        stat = os.stat(source)
+        with open(path(source, kind), "rb") as f:
+            unpickler = pickle.Unpickler(f)
+            if unpickler.load() != (FORMAT, stat.st_size, stat.st_mtime_ns):
+                return None
+            return unpickler.load()
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+
+def save(source: str, kind: str, state: Dict) -> None:
+    """Save the state of kind for source, replacing its snapshot
+    atomically
+    """
+    snapshot = path(source, kind)
+    temporary = "{}.{}".format(snapshot, os.getpid())
+    try:
+        stat = os.stat(source)
+        with open(temporary, "wb") as f:
+            pickler = pickle.Pickler(f, pickle.HIGHEST_PROTOCOL)
+            pickler.dump((FORMAT, stat.st_size, stat.st_mtime_ns))
+            pickler.dump(state)
+        os.replace(temporary, snapshot)
+    except OSError:
+        if os.path.exists(temporary):
+            os.remove(temporary)